@@ -0,0 +1,261 @@
+# Kaynak Kabul Kontrolu Modulu
+# Girdi boyutu ve adim ayarlarindan tepe bellek ve sure tahmini yapar; limit
+# asilirsa plani otomatik hafifletir (karolama, hafif model, dusuk olcek)
+# veya istegi acik bir hata ile reddeder
+
+import os
+
+import numpy as np
+
+from .pipeline import DEFAULT_PARAMS
+from .super_resolution import BICUBIC_MODEL, MODEL_URLS, LUMA_MODELS
+
+
+MB = 1024 * 1024
+
+# Model başına DNN ara katman kanal sayısı (düşük çözünürlükte) ve bu kanalların
+# yüksek çözünürlükte mi (LapSRN) hesaplandığı
+MODEL_FEATURES = {
+    "edsr": {"channels": 64, "hr_features": False},
+    "fsrcnn": {"channels": 56, "hr_features": False},
+    "espcn": {"channels": 64, "hr_features": False},
+    "lapsrn": {"channels": 64, "hr_features": True},
+    BICUBIC_MODEL: {"channels": 0, "hr_features": False}
+}
+
+# Kaba süre kalibrasyonu: girdi megapikseli başına saniye (tek CPU çekirdeği)
+# src.tuning ölçümleriyle makineye göre güncellenebilir
+STAGE_SECONDS_PER_MP = {
+    "denoise": 1.5,
+    "contrast": 0.02,
+    "sharpen": 0.03
+}
+MODEL_SECONDS_PER_MP = {
+    "edsr": 12.0,
+    "lapsrn": 1.5,
+    "fsrcnn": 0.3,
+    "espcn": 0.1,
+    BICUBIC_MODEL: 0.01
+}
+
+# Hafiflik sırası: ağırdan hafife
+MODEL_LADDER = ["edsr", "lapsrn", "fsrcnn", "espcn", BICUBIC_MODEL]
+
+# Denenecek karo boyutları (büyükten küçüğe)
+TILE_LADDER = [512, 256, 128]
+
+
+class ResourceLimitError(RuntimeError):
+    pass
+
+
+class ResourceLimits:
+
+
+    def __init__(self,
+                 max_memory_mb: float = None,
+                 max_seconds: float = None,
+                 max_output_pixels: int = None):
+
+        self.max_memory_mb = max_memory_mb
+        self.max_seconds = max_seconds
+        self.max_output_pixels = max_output_pixels
+
+    @classmethod
+    def from_env(cls) -> "ResourceLimits":
+
+        # Ortam değişkeni yoksa bellek limiti fiziksel RAM'in yarısıdır
+        def read(name, cast, default):
+            value = os.environ.get(name)
+            return cast(value) if value else default
+
+        return cls(
+            max_memory_mb=read("ENHANCER_MAX_MEMORY_MB", float, _physical_memory_mb() / 2),
+            max_seconds=read("ENHANCER_MAX_SECONDS", float, None),
+            max_output_pixels=read("ENHANCER_MAX_OUTPUT_PIXELS", int, 8192 * 8192)
+        )
+
+    def per_worker(self, workers: int) -> "ResourceLimits":
+
+        # Eşzamanlı işler bellek limitini paylaşır; süre ve çıktı iş başınadır
+        memory = self.max_memory_mb
+        return ResourceLimits(
+            max_memory_mb=memory / max(1, workers) if memory is not None else None,
+            max_seconds=self.max_seconds,
+            max_output_pixels=self.max_output_pixels
+        )
+
+
+def _physical_memory_mb() -> float:
+
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / MB
+    except (ValueError, OSError, AttributeError):
+        # sysconf olmayan platformlar için makul varsayılan
+        return 8192.0
+
+
+def estimate_resources(shape: tuple, dtype, params: dict) -> dict:
+
+    params = {**DEFAULT_PARAMS, **params}
+
+    height, width = shape[:2]
+    channels = shape[2] if len(shape) == 3 else 1
+    pixels = height * width
+    megapixels = pixels / 1e6
+    itemsize = np.dtype(dtype).itemsize
+
+    # Float modu (veya 16-bit girdi) ara sonuçları float32 tutar
+    float_mode = params["float_mode"] or np.dtype(dtype) != np.uint8
+    work_itemsize = 4 if float_mode else itemsize
+
+    # Luma modunda ağır adımlar tek kanalda çalışır
+    heavy_channels = 1 if params["luma_mode"] else channels
+
+    image_bytes = pixels * channels * itemsize
+    work_bytes = pixels * channels * work_itemsize
+
+    # Adım başına geçici bellek (adımlar sırayla çalışır, en büyüğü belirleyicidir)
+    stage_bytes = {}
+    seconds = 0.0
+
+    if params["denoise_enabled"]:
+        # LAB dönüşümü, kenar genişletilmiş kopya ve çıktı
+        stage_bytes["denoise"] = 4 * pixels * heavy_channels * max(work_itemsize, 2)
+        seconds += STAGE_SECONDS_PER_MP["denoise"] * megapixels * heavy_channels / channels
+
+    if params["contrast_enabled"]:
+        # LAB, L kanalı ve birleştirme
+        stage_bytes["contrast"] = 3 * work_bytes
+        seconds += STAGE_SECONDS_PER_MP["contrast"] * megapixels
+
+    if params["sharpen_enabled"]:
+        # float32 kopya, bulanık, fark ve sonuç
+        stage_bytes["sharpen"] = 4 * pixels * heavy_channels * 4
+        seconds += STAGE_SECONDS_PER_MP["sharpen"] * megapixels
+
+    scale = params["scale"] if params["super_res_enabled"] else 1
+    output_shape = (height * scale, width * scale) + tuple(shape[2:])
+    output_bytes = pixels * scale * scale * channels * itemsize
+
+    if params["super_res_enabled"]:
+        model = params["model_name"]
+        features = MODEL_FEATURES[model]
+
+        # DNN sadece karo kadar alanı aynı anda işler
+        tile = params["sr_tile_size"]
+        dnn_pixels = min(pixels, tile * tile) if tile else pixels
+        if features["hr_features"]:
+            dnn_pixels *= scale * scale
+
+        # Y-kanallı modeller tek kanal, EDSR üç kanal girdi/çıktı blobu
+        model_channels = 1 if model in LUMA_MODELS else 3
+        activations = 2 * features["channels"] * dnn_pixels * 4
+        shuffle = features["channels"] * min(pixels, dnn_pixels) * scale * scale * 4 \
+            if not features["hr_features"] else 0
+        blobs = (dnn_pixels + dnn_pixels * scale * scale) * model_channels * 4
+
+        stage_bytes["super_res"] = activations + shuffle + blobs + output_bytes
+        seconds += MODEL_SECONDS_PER_MP[model] * megapixels * \
+            (scale * scale / 4 if features["hr_features"] else 1)
+
+    peak_bytes = image_bytes + work_bytes + max(stage_bytes.values(), default=0) + output_bytes
+
+    return {
+        "peak_mb": peak_bytes / MB,
+        "seconds": seconds,
+        "output_shape": output_shape,
+        "stages_mb": {name: value / MB for name, value in stage_bytes.items()}
+    }
+
+
+def _violations(estimate: dict, limits: ResourceLimits) -> list:
+
+    problems = []
+    if limits.max_memory_mb is not None and estimate["peak_mb"] > limits.max_memory_mb:
+        problems.append("memory")
+    if limits.max_seconds is not None and estimate["seconds"] > limits.max_seconds:
+        problems.append("time")
+
+    output_pixels = estimate["output_shape"][0] * estimate["output_shape"][1]
+    if limits.max_output_pixels is not None and output_pixels > limits.max_output_pixels:
+        problems.append("output")
+
+    return problems
+
+
+def _model_scales(model: str) -> list:
+
+    # Bicubic her ölçeği destekler
+    if model == BICUBIC_MODEL:
+        return [2, 3, 4]
+    return list(MODEL_URLS[model])
+
+
+def _lighter_models(model: str, scale: int) -> list:
+
+    # Aynı ölçeği destekleyen, mevcut modelden daha hafif modeller
+    if model not in MODEL_LADDER:
+        return []
+    index = MODEL_LADDER.index(model)
+    return [m for m in MODEL_LADDER[index + 1:] if scale in _model_scales(m)]
+
+
+def admit(shape: tuple,
+          dtype,
+          params: dict,
+          limits: ResourceLimits) -> dict:
+
+    params = {**DEFAULT_PARAMS, **params}
+    actions = []
+
+    estimate = estimate_resources(shape, dtype, params)
+    problems = _violations(estimate, limits)
+
+    # Hafifletme sırası: karolama (bellek), hafif model (süre/bellek),
+    # düşük ölçek (çıktı boyutu/bellek/süre)
+    while problems and params["super_res_enabled"]:
+        candidate = None
+
+        if "memory" in problems and "output" not in problems:
+            current = params["sr_tile_size"]
+            smaller = [t for t in TILE_LADDER if current is None or t < current]
+            if smaller:
+                candidate = ({**params, "sr_tile_size": smaller[0]},
+                             f"karolama: {smaller[0]}px")
+
+        if candidate is None and "output" not in problems:
+            lighter = _lighter_models(params["model_name"], params["scale"])
+            if lighter:
+                candidate = ({**params, "model_name": lighter[0]},
+                             f"model: {params['model_name']} -> {lighter[0]}")
+
+        if candidate is None:
+            lower = [s for s in sorted(_model_scales(params["model_name"]), reverse=True)
+                     if s < params["scale"]]
+            if lower:
+                candidate = ({**params, "scale": lower[0]},
+                             f"ölçek: x{params['scale']} -> x{lower[0]}")
+
+        if candidate is None:
+            break
+
+        params, action = candidate
+        actions.append(action)
+        estimate = estimate_resources(shape, dtype, params)
+        problems = _violations(estimate, limits)
+
+    if problems:
+        raise ResourceLimitError(
+            f"İstek kaynak limitlerini aşıyor ({', '.join(problems)}): "
+            f"tahmini bellek {estimate['peak_mb']:.0f} MB "
+            f"(limit {limits.max_memory_mb}), süre {estimate['seconds']:.1f} s "
+            f"(limit {limits.max_seconds}), çıktı {estimate['output_shape'][1]}x"
+            f"{estimate['output_shape'][0]} (limit {limits.max_output_pixels} piksel). "
+            f"Daha küçük bir girdi veya ölçek seçin."
+        )
+
+    for action in actions:
+        print(f"[UYARI] Plan hafifletildi: {action}")
+
+    return {"params": params, "estimate": estimate, "actions": actions}
@@ -0,0 +1,296 @@
+# CLAHE Motoru Modulu
+# CLAHE nesnelerini onbellekler, gri goruntulerde tek kanal isler ve
+# video icin karo histogramlarini kareler arasinda yumusatarak yeniden kullanir
+
+import threading
+
+import cv2
+import numpy as np
+
+from .utils import to_float32
+
+
+# CLAHE nesneleri thread-safe değildir; her thread kendi önbelleğini tutar
+_CLAHE_CACHE = threading.local()
+
+
+def get_clahe(clip_limit: float = 2.0, tile_grid_size: tuple = (8, 8)):
+
+    cache = getattr(_CLAHE_CACHE, "instances", None)
+    if cache is None:
+        cache = _CLAHE_CACHE.instances = {}
+
+    key = (float(clip_limit), tuple(tile_grid_size))
+
+    # Aynı ayarlar için nesneyi her çağrıda yeniden oluşturma
+    if key not in cache:
+        cache[key] = cv2.createCLAHE(
+            clipLimit=clip_limit,
+            tileGridSize=tuple(tile_grid_size)
+        )
+
+    return cache[key]
+
+
+def is_effectively_gray(image: np.ndarray) -> bool:
+
+    if len(image.shape) == 2:
+        return True
+
+    # Sadece birebir eşit kanallar (load_image gri IR görüntüleri 3 kanala
+    # kopyalar); hafif renk tonu olan kareler renkli yoldan işlenir
+    return bool(np.array_equal(image[:, :, 0], image[:, :, 1]) and
+                np.array_equal(image[:, :, 1], image[:, :, 2]))
+
+
+# _split_plane işareti: düzlem gri tablodan gelen L kanalıdır
+_GRAY_PLANE = "gray"
+
+# 8-bit gri -> LAB L ve L -> BGR tabloları (gri pikselde a = b = 128)
+_GRAY_LAB_LUTS = []
+
+
+def gray_lab_luts():
+
+    if not _GRAY_LAB_LUTS:
+        ramp = np.arange(256, dtype=np.uint8).reshape(1, 256)
+        to_l = cv2.cvtColor(cv2.cvtColor(ramp, cv2.COLOR_GRAY2BGR), cv2.COLOR_BGR2LAB)[:, :, 0]
+        neutral = np.full_like(ramp, 128)
+        from_l = cv2.cvtColor(cv2.merge([ramp, neutral, neutral]), cv2.COLOR_LAB2BGR)
+        _GRAY_LAB_LUTS.extend([to_l, from_l])
+
+    return _GRAY_LAB_LUTS[0], _GRAY_LAB_LUTS[1]
+
+
+def gray_to_lightness(plane: np.ndarray) -> np.ndarray:
+    return cv2.LUT(plane, gray_lab_luts()[0])
+
+
+def lightness_to_bgr(plane: np.ndarray) -> np.ndarray:
+
+    # LAB yolu ile aynı sonuç: L -> BGR, tek tablo araması
+    return cv2.LUT(cv2.merge([plane, plane, plane]), gray_lab_luts()[1])
+
+
+class ClaheEngine:
+
+
+    def __init__(self,
+                 clip_limit: float = 2.0,
+                 tile_grid_size: tuple = (8, 8),
+                 temporal_alpha: float = 0.25,
+                 refresh_interval: int = 1,
+                 hist_stride: int = 1):
+
+        if not 0.0 < temporal_alpha <= 1.0:
+            raise ValueError(f"temporal_alpha 0 ile 1 arasında olmalı: {temporal_alpha}")
+
+        self.clip_limit = clip_limit
+        self.tile_grid_size = tuple(tile_grid_size)
+        self.temporal_alpha = temporal_alpha
+        self.refresh_interval = max(1, int(refresh_interval))
+        self.hist_stride = max(1, int(hist_stride))
+
+        self.reset()
+
+    def reset(self):
+
+        self._histograms = None
+        self._luts = None
+        self._shape = None
+        self._grid = None
+        self._frame_index = 0
+
+    def _split_plane(self, image: np.ndarray):
+
+        # 8-bit dışı girdiler 0-1 aralığında float32 olarak işlenir
+        if image.dtype != np.uint8:
+            image = to_float32(image)
+
+        # Tek kanallı girdi doğrudan işlenir
+        if len(image.shape) == 2:
+            return image, None
+
+        # Gri hızlı yol (8-bit): LAB dönüşümü yerine gri -> L tablosu
+        if image.dtype == np.uint8 and is_effectively_gray(image):
+            return gray_to_lightness(np.ascontiguousarray(image[:, :, 0])), _GRAY_PLANE
+
+        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+
+        # Float LAB'de L kanalı 0-100 aralığındadır
+        if lab.dtype == np.float32:
+            return lab[:, :, 0] * (1.0 / 100.0), lab
+
+        return np.ascontiguousarray(lab[:, :, 0]), lab
+
+    def _merge_plane(self, image: np.ndarray, plane: np.ndarray, lab) -> np.ndarray:
+
+        if lab is None:
+            return plane
+
+        if lab is _GRAY_PLANE:
+            return lightness_to_bgr(plane)
+
+        if lab.dtype == np.float32:
+            lab[:, :, 0] = plane * 100.0
+        else:
+            lab[:, :, 0] = plane
+        return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+
+    def _quantize(self, plane: np.ndarray) -> np.ndarray:
+
+        # Histogramlar her zaman 256 seviyede tutulur (8-bit CLAHE semantiği)
+        if plane.dtype == np.uint8:
+            return plane
+        return np.rint(np.clip(plane, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+    def apply(self, image: np.ndarray) -> np.ndarray:
+
+        plane, lab = self._split_plane(image)
+
+        if plane.dtype == np.uint8:
+            enhanced = get_clahe(self.clip_limit, self.tile_grid_size).apply(plane)
+        else:
+            # Yüksek bit derinliği: 8-bit histogramdan LUT, float hassasiyetinde uygulama
+            luts = self._build_luts(
+                self._tile_histograms(self._quantize(plane)),
+                np.prod(self._tile_size(*plane.shape))
+            )
+            enhanced = self._interpolate(plane, luts)
+
+        return self._merge_plane(image, enhanced, lab)
+
+    def _tile_size(self, height: int, width: int) -> tuple:
+
+        tiles_x, tiles_y = self.tile_grid_size
+        return -(-height // tiles_y), -(-width // tiles_x)
+
+    def _tile_histograms(self, plane: np.ndarray) -> np.ndarray:
+
+        tiles_x, tiles_y = self.tile_grid_size
+        height, width = plane.shape
+        tile_h, tile_w = self._tile_size(height, width)
+
+        # Tüm karoların histogramı tek bincount ile. hist_stride > 1 histogramı
+        # alt örnekler: 1080p'de fark ihmal edilebilir (L'de en fazla ~4 seviye),
+        # küçük ve gürültülü karelerde (240x320) OpenCV'den ~10 seviye sapabilir
+        step = self.hist_stride
+        sample = plane[::step, ::step]
+        rows = (np.arange(0, height, step) // tile_h).astype(np.int64)
+        cols = (np.arange(0, width, step) // tile_w).astype(np.int64)
+
+        index = (rows[:, None] * tiles_x + cols[None, :]) * 256 + sample
+        counts = np.bincount(index.ravel(), minlength=tiles_x * tiles_y * 256)
+
+        # Karo boyutları farklı olabilir: her histogramı olasılığa normalize et
+        hist = counts.reshape(tiles_y, tiles_x, 256).astype(np.float32)
+        totals = hist.sum(axis=2, keepdims=True)
+
+        return hist / np.maximum(totals, 1.0)
+
+    def _build_luts(self, hist: np.ndarray, tile_area: int) -> np.ndarray:
+
+        # Olasılık histogramını karo alanına göre sayıma çevir
+        counts = hist * tile_area
+
+        # OpenCV ile aynı kırpma: tamsayı clip_limit * (karo alanı / 256), en az 1
+        # (clip_limit <= 0 ise kırpma yapılmaz)
+        if self.clip_limit > 0:
+            limit = max(int(self.clip_limit * tile_area / 256), 1)
+            excess = np.maximum(counts - limit, 0).sum(axis=2, keepdims=True)
+            counts = np.minimum(counts, limit)
+
+            # Fazlalık tüm seviyelere eşit dağıtılır, kalan kısım OpenCV gibi
+            # baştan itibaren belirli adımlarla birer birer eklenir
+            batch = np.floor(excess / 256)
+            residual = np.floor(excess - batch * 256)
+            step = np.maximum(256 // np.maximum(residual, 1), 1)
+            levels = np.arange(256, dtype=np.float32)
+            extra = (levels % step == 0) & (levels // step < residual)
+            counts = counts + batch + extra
+
+        cdf = np.cumsum(counts, axis=2) * (255.0 / tile_area)
+        return np.clip(cdf, 0, 255).astype(np.float32)
+
+    def _interpolation_grid(self, height: int, width: int):
+
+        tiles_x, tiles_y = self.tile_grid_size
+        tile_h, tile_w = self._tile_size(height, width)
+
+        # Her piksel için en yakın 4 karo ve bilineer ağırlıklar
+        fy = (np.arange(height, dtype=np.float32) + 0.5) / tile_h - 0.5
+        fx = (np.arange(width, dtype=np.float32) + 0.5) / tile_w - 0.5
+        y0 = np.clip(np.floor(fy), 0, tiles_y - 1).astype(np.int32)
+        x0 = np.clip(np.floor(fx), 0, tiles_x - 1).astype(np.int32)
+        y1 = np.minimum(y0 + 1, tiles_y - 1)
+        x1 = np.minimum(x0 + 1, tiles_x - 1)
+        wy = np.clip(fy - y0, 0.0, 1.0).astype(np.float32)[:, None]
+        wx = np.clip(fx - x0, 0.0, 1.0).astype(np.float32)[None, :]
+
+        # Düzleştirilmiş LUT dizisinde her pikselin 4 karo başlangıç indeksi
+        offsets = [
+            ((ty[:, None] * tiles_x + tx[None, :]) * 256).astype(np.int32)
+            for ty, tx in ((y0, x0), (y0, x1), (y1, x0), (y1, x1))
+        ]
+
+        return offsets, wy, wx
+
+    def _interpolate(self, plane: np.ndarray, luts: np.ndarray) -> np.ndarray:
+
+        # Izgara sadece çözünürlük değiştiğinde hesaplanır
+        if self._grid is None or self._grid[0] != plane.shape:
+            self._grid = (plane.shape, self._interpolation_grid(*plane.shape))
+        offsets, wy, wx = self._grid[1]
+
+        luts = luts.ravel()
+        if plane.dtype == np.uint8:
+            v00, v01, v10, v11 = (luts[offset + plane] for offset in offsets)
+        else:
+            # Float girdi: LUT girişleri arasında doğrusal enterpolasyon (bantlanma olmaz)
+            x = np.clip(plane, 0.0, 1.0) * 255.0
+            base = np.minimum(np.floor(x), 254.0)
+            t = x - base
+            index = base.astype(np.int32)
+            v00, v01, v10, v11 = (
+                luts[offset + index] + t * (luts[offset + index + 1] - luts[offset + index])
+                for offset in offsets
+            )
+
+        top = v00 + wx * (v01 - v00)
+        bottom = v10 + wx * (v11 - v10)
+        result = top + wy * (bottom - top)
+
+        if plane.dtype == np.uint8:
+            return np.clip(result + 0.5, 0, 255).astype(np.uint8)
+        return np.clip(result * (1.0 / 255.0), 0.0, 1.0)
+
+    def apply_video(self, frame: np.ndarray) -> np.ndarray:
+
+        plane, lab = self._split_plane(frame)
+
+        # Çözünürlük değişirse geçmiş histogramlar geçersizdir
+        if self._shape != plane.shape:
+            self.reset()
+            self._shape = plane.shape
+
+        # Histogramları her refresh_interval karede bir yeniden hesapla,
+        # aradaki karelerde önceki LUT'ları kullan
+        if self._luts is None or self._frame_index % self.refresh_interval == 0:
+            hist = self._tile_histograms(self._quantize(plane))
+
+            # Üstel yumuşatma: kareden kareye kontrast titremesini önler
+            if self._histograms is None:
+                self._histograms = hist
+            else:
+                self._histograms += self.temporal_alpha * (hist - self._histograms)
+
+            self._luts = self._build_luts(
+                self._histograms,
+                np.prod(self._tile_size(*plane.shape))
+            )
+
+        self._frame_index += 1
+
+        enhanced = self._interpolate(plane, self._luts)
+
+        return self._merge_plane(frame, enhanced, lab)
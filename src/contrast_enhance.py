@@ -4,11 +4,35 @@
 import cv2
 import numpy as np
 
+from .clahe_engine import (ClaheEngine, get_clahe, is_effectively_gray,
+                           gray_to_lightness, lightness_to_bgr)
+from .scene_stats import SceneStatistics
+from .utils import get_max_value, to_float32, from_float32
+
 
 def apply_clahe(image: np.ndarray,
                 clip_limit: float = 2.0,
                 tile_grid_size: tuple = (8, 8)) -> np.ndarray:
     
+    # 16-bit/float girdi: cv2 CLAHE float desteklemez, motorun float yolu kullanılır
+    if image.dtype != np.uint8:
+        engine = ClaheEngine(clip_limit, tile_grid_size, hist_stride=1)
+        result = engine.apply(image)
+        return result if image.dtype == np.float32 else from_float32(result, image.dtype)
+    
+    # CLAHE nesnesini önbellekten al (aynı ayarlar için tekrar oluşturulmaz)
+    clahe = get_clahe(clip_limit, tile_grid_size)
+    
+    # Tek kanallı (parlaklık) girdi doğrudan CLAHE'ye verilir
+    if len(image.shape) == 2:
+        return clahe.apply(image)
+    
+    # Gri görüntü 3 kanala kopyalanmışsa (IR gece görüntüsü) tek kanal işle;
+    # LAB dönüşümü yerine tablolarla gri -> L -> CLAHE -> BGR (aynı sonuç)
+    if is_effectively_gray(image):
+        lightness = gray_to_lightness(np.ascontiguousarray(image[:, :, 0]))
+        return lightness_to_bgr(clahe.apply(lightness))
+    
     # BGR'den LAB renk uzayına dönüştür
     # LAB uzayı, parlaklık (L) ve renk (A, B) bilgisini ayırır
     lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
@@ -16,12 +40,6 @@ def apply_clahe(image: np.ndarray,
     # L kanalını ayır (parlaklık kanalı)
     l_channel, a_channel, b_channel = cv2.split(lab)
     
-    # CLAHE nesnesini oluştur
-    clahe = cv2.createCLAHE(
-        clipLimit=clip_limit,
-        tileGridSize=tile_grid_size
-    )
-    
     # CLAHE'yi sadece L kanalına uygula
     # Bu sayede renk bilgisi bozulmaz
     l_enhanced = clahe.apply(l_channel)
@@ -37,6 +55,11 @@ def apply_clahe(image: np.ndarray,
 
 def apply_gamma_correction(image: np.ndarray, gamma: float = 1.0) -> np.ndarray:
     
+    # 16-bit/float girdi: LUT sadece 8-bit destekler, doğrudan üs alınır
+    if image.dtype != np.uint8:
+        corrected = cv2.pow(to_float32(image), 1.0 / gamma)
+        return corrected if image.dtype == np.float32 else from_float32(corrected, image.dtype)
+    
     # Lookup table oluştur (performans optimizasyonu)
     # Her 0-255 değeri için gamma dönüşümünü önceden hesapla
     inv_gamma = 1.0 / gamma
@@ -50,16 +73,23 @@ def apply_gamma_correction(image: np.ndarray, gamma: float = 1.0) -> np.ndarray:
 
 
 def auto_gamma_correction(image: np.ndarray, 
-                          target_brightness: int = 128) -> np.ndarray:
-    
-    # Görüntüyü gri tonlamaya çevir ve ortalama parlaklığı hesapla
-    if len(image.shape) == 3:
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                          target_brightness: int = 128,
+                          stats: SceneStatistics = None) -> np.ndarray:
+    
+    if stats is not None and stats.ready:
+        # Video: yumuşatılmış sahne parlaklığını kullan (kare taraması yok).
+        # stats bu fonksiyona verilen görüntüyle güncellenmiş olmalı; CLAHE
+        # öncesi istatistik yanlış gamma verir. Değer zaten 8-bit ölçeğindedir
+        current_brightness = stats.brightness
     else:
-        gray = image
-    
-    # Mevcut ortalama parlaklık
-    current_brightness = np.mean(gray)
+        # Görüntüyü gri tonlamaya çevir ve ortalama parlaklığı hesapla
+        if len(image.shape) == 3:
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = image
+        
+        # Mevcut ortalama parlaklık (8-bit ölçeğinde)
+        current_brightness = np.mean(gray) * 255.0 / get_max_value(image.dtype)
     
     # Sıfıra bölme hatasını önle
     if current_brightness == 0:
@@ -87,6 +117,8 @@ def enhance_contrast_and_brightness(image: np.ndarray,
     if gamma is not None:
         result = apply_gamma_correction(result, gamma)
     elif auto_brightness:
+        # Parlaklık CLAHE çıktısından ölçülür; girdi karesinin sahne
+        # istatistikleri CLAHE sonrasını tarif etmediği için kullanılmaz
         result = auto_gamma_correction(result)
     
     return result
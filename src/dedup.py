@@ -0,0 +1,336 @@
+# Tekrar Eden Goruntu Onbellegi Modulu
+# Algisal hash (pHash) ile ayni/benzer girdileri tespit eder ve ayni parametre
+# setiyle daha once iyilestirilmis sonucu kopyalar (tam pipeline calistirmadan)
+# Kullanim: python -m src.dedup --input arsiv/ --output cikti/
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+import cv2
+import numpy as np
+
+from .admission import ResourceLimitError, ResourceLimits, admit
+from .pipeline import DEFAULT_PARAMS, run_pipeline, load_presets
+from .super_resolution import BICUBIC_MODEL, SuperResolution
+from .utils import list_images_in_directory, load_image, save_image, to_float32
+
+
+# Dizin dosyasının varsayılan yolu
+INDEX_PATH = "./dedup_index.json"
+
+
+def perceptual_hash(image: np.ndarray, hash_size: int = 8) -> int:
+
+    # Bit derinliğinden bağımsız: 0-1 float gri görüntü
+    image = to_float32(image)
+    if len(image.shape) == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    # 32x32'ye küçült, DCT al, düşük frekanslı 8x8 bloğu medyana göre bitle
+    size = hash_size * 4
+    small = cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
+    dct = cv2.dct(small)
+    low = dct[:hash_size, :hash_size].ravel()
+
+    # DC bileşeni medyanı bozmasın diye hariç tutulur
+    bits = low > np.median(low[1:])
+
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def params_key(params: dict) -> str:
+
+    # Aynı parametre seti her zaman aynı anahtarı üretir
+    params = {**DEFAULT_PARAMS, **params}
+    data = json.dumps(params, sort_keys=True)
+
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(image: np.ndarray, params: dict) -> str:
+
+    # pHash küçük resim üzerinden hesaplanır; aynı sahnenin farklı çözünürlük
+    # veya bit derinliğindeki kopyası farklı boyutta çıktı üretir
+    shape = "x".join(str(size) for size in image.shape)
+    return f"{params_key(params)}:{shape}:{image.dtype.str}"
+
+
+def _file_signature(path: str):
+
+    # Çıktı dosyası sonradan üzerine yazıldıysa kayıt geçersizdir
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class DedupIndex:
+
+
+    def __init__(self,
+                 path: str = INDEX_PATH,
+                 threshold: int = 4,
+                 hash_bits: int = 64):
+
+        if threshold < 0 or threshold >= hash_bits:
+            raise ValueError(f"Geçersiz Hamming eşiği: {threshold}")
+
+        self.path = path
+        self.threshold = threshold
+        self.hash_bits = hash_bits
+        self.entries = []
+
+        # Güvercin yuvası ilkesi: hash threshold+1 banda bölünür, eşik içindeki
+        # her eşleşme en az bir bantta birebir aynıdır (tüm dizini taramaya gerek yok)
+        self._bands = []
+        band_count = threshold + 1
+        start = 0
+        for i in range(band_count):
+            width = hash_bits // band_count + (1 if i < hash_bits % band_count else 0)
+            self._bands.append((start, width))
+            start += width
+        self._buckets = {}
+
+        self.load()
+
+    def _band_keys(self, key: str, value: int) -> list:
+        return [
+            (key, i, (value >> start) & ((1 << width) - 1))
+            for i, (start, width) in enumerate(self._bands)
+        ]
+
+    def _rebuild(self, entries: list):
+
+        self.entries = []
+        self._buckets = {}
+        for entry in entries:
+            self._insert(entry)
+
+    def _insert(self, entry: dict):
+
+        index = len(self.entries)
+        self.entries.append(entry)
+        for band_key in self._band_keys(entry["params"], entry["hash"]):
+            self._buckets.setdefault(band_key, []).append(index)
+
+    def load(self):
+
+        self._rebuild([])
+
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self._rebuild(data.get("entries", []))
+
+    def save(self):
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        # Yarım yazılmış dizin bırakmamak için önce geçici dosyaya yaz
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+    def lookup(self, image_hash: int, key: str) -> str:
+
+        best_path = None
+        best_distance = self.threshold + 1
+
+        candidates = set()
+        for band_key in self._band_keys(key, image_hash):
+            candidates.update(self._buckets.get(band_key, []))
+
+        for index in candidates:
+            entry = self.entries[index]
+            distance = hamming_distance(image_hash, entry["hash"])
+
+            # Silinmiş veya üzerine yazılmış çıktılar önbellek isabeti sayılmaz
+            if distance < best_distance and \
+                    _file_signature(entry["output"]) == entry.get("signature"):
+                best_path = entry["output"]
+                best_distance = distance
+
+        return best_path
+
+    def discard(self, output_path: str):
+
+        # Aynı dosyaya yazılmış eski kayıtlar (başka parametre seti) artık geçersiz
+        if any(entry["output"] == output_path for entry in self.entries):
+            self._rebuild([e for e in self.entries if e["output"] != output_path])
+
+    def add(self, image_hash: int, key: str, output_path: str):
+
+        self.discard(output_path)
+        self._insert({
+            "hash": image_hash,
+            "params": key,
+            "output": output_path,
+            "signature": _file_signature(output_path)
+        })
+
+
+def _link_or_copy(source: str, target: str, use_link: bool = True):
+
+    if os.path.exists(target):
+        os.remove(target)
+
+    # Hard link disk alanı harcamaz; farklı dosya sistemlerinde kopyaya düş
+    if use_link:
+        try:
+            os.link(source, target)
+            return
+        except OSError:
+            pass
+
+    shutil.copy2(source, target)
+
+
+def _plan_model(params: dict, models: dict, models_dir: str) -> tuple:
+
+    # Kabul kontrolü daha hafif bir model seçmiş olabilir; modeller bir kez yüklenir
+    if not params["super_res_enabled"] or params["model_name"] == BICUBIC_MODEL:
+        return params, None
+
+    key = (params["model_name"], params["scale"])
+    if key not in models:
+        try:
+            models[key] = SuperResolution(
+                model_name=params["model_name"],
+                scale=params["scale"],
+                models_dir=models_dir
+            )
+        except Exception as e:
+            print(f"[UYARI] Model yüklenemedi, bicubic kullanılıyor: {e}")
+            models[key] = None
+
+    if models[key] is None:
+        return {**params, "model_name": BICUBIC_MODEL}, None
+    return params, models[key]
+
+
+def process_directory(input_dir: str,
+                      output_dir: str,
+                      params: dict,
+                      index: DedupIndex,
+                      sr: SuperResolution = None,
+                      use_link: bool = True,
+                      limits: ResourceLimits = None,
+                      models_dir: str = "./models") -> dict:
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Model yoksa pipeline bicubic kullanır; sonuçlar model anahtarıyla saklanmaz
+    params = {**DEFAULT_PARAMS, **params}
+    if params["super_res_enabled"] and sr is None:
+        params = {**params, "model_name": BICUBIC_MODEL}
+
+    limits = limits or ResourceLimits.from_env()
+    models = {(params["model_name"], params["scale"]): sr} if sr is not None else {}
+
+    stats = {"processed": 0, "duplicates": 0, "rejected": 0}
+    paths = list_images_in_directory(input_dir)
+
+    for path in paths:
+        image = load_image(path)
+
+        # Her görüntü kabul kontrolünden geçer; limiti aşan görüntü atlanır
+        try:
+            plan = admit(image.shape, image.dtype, params, limits)
+        except ResourceLimitError as e:
+            print(f"[UYARI] Atlandı: {path}: {e}")
+            stats["rejected"] += 1
+            continue
+        image_params, image_sr = _plan_model(plan["params"], models, models_dir)
+
+        image_hash = perceptual_hash(image)
+        name = os.path.splitext(os.path.basename(path))[0]
+        key = cache_key(image, image_params)
+
+        cached = index.lookup(image_hash, key)
+        if cached is not None:
+            # Tekrar eden kare: mevcut sonucu bağla/kopyala
+            target = os.path.join(output_dir, name + os.path.splitext(cached)[1])
+            if os.path.abspath(target) != os.path.abspath(cached):
+                index.discard(os.path.abspath(target))
+                _link_or_copy(cached, target, use_link)
+            stats["duplicates"] += 1
+            continue
+
+        target = os.path.join(output_dir, os.path.basename(path))
+        result = run_pipeline(image, image_params, sr=image_sr)
+
+        # Yerinde üzerine yazma, bu dosyaya hard link ile bağlanmış tekrar
+        # kopyalarını da değiştirir; her kayıt yeni bir dosya (inode) oluşturur
+        if os.path.exists(target):
+            os.remove(target)
+
+        if save_image(result, target):
+            index.add(image_hash, key, os.path.abspath(target))
+        stats["processed"] += 1
+
+    index.save()
+
+    print(f"[INFO] {stats['processed']} görüntü işlendi, "
+          f"{stats['duplicates']} tekrar eden görüntü önbellekten alındı, "
+          f"{stats['rejected']} görüntü kaynak limiti nedeniyle atlandı")
+
+    return stats
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Tekrar eden görüntüleri atlayan toplu iyileştirme")
+    parser.add_argument("--input", required=True, help="Girdi görüntü klasörü")
+    parser.add_argument("--output", required=True, help="Çıktı klasörü")
+    parser.add_argument("--index", default=INDEX_PATH, help="pHash dizin dosyası")
+    parser.add_argument("--threshold", type=int, default=4, help="Hamming mesafesi eşiği")
+    parser.add_argument("--preset", default=None, help="Hazır ayar adı (presets.json)")
+    parser.add_argument("--models-dir", default="./models")
+    parser.add_argument("--copy", action="store_true", help="Hard link yerine kopyala")
+    args = parser.parse_args()
+
+    params = dict(DEFAULT_PARAMS)
+    if args.preset is not None:
+        presets = load_presets()
+        if args.preset not in presets:
+            raise ValueError(f"Hazır ayar bulunamadı: {args.preset}. "
+                             f"Mevcut ayarlar: {list(presets.keys())}")
+        params = presets[args.preset]
+
+    sr = None
+    if params["super_res_enabled"] and params["model_name"] != BICUBIC_MODEL:
+        try:
+            sr = SuperResolution(
+                model_name=params["model_name"],
+                scale=params["scale"],
+                models_dir=args.models_dir
+            )
+        except Exception as e:
+            print(f"[UYARI] Model yüklenemedi, bicubic kullanılıyor: {e}")
+            params = {**params, "model_name": BICUBIC_MODEL}
+
+    index = DedupIndex(args.index, threshold=args.threshold)
+    process_directory(args.input, args.output, params, index, sr=sr,
+                      use_link=not args.copy, models_dir=args.models_dir)
+
+
+if __name__ == "__main__":
+    main()
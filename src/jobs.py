@@ -0,0 +1,269 @@
+# Arka Plan Is Yoneticisi Modulu
+# Iyilestirme islerini oturumlar arasi paylasilan sinirli bir thread havuzunda
+# calistirir; her is adim bazinda ilerleme raporlar ve adimlar arasinda iptal edilebilir.
+# Asamali modda once hizli onizleme (bicubic/ESPCN), sonra model sonucu uretilir;
+# ayni gruptaki yeni is eskisini gecersiz kilar
+
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import numpy as np
+
+from .admission import ResourceLimits, admit
+from .parallelism import configure_threads
+from .pipeline import DEFAULT_PARAMS, pipeline_stages, run_pipeline, super_resolve
+from .super_resolution import BICUBIC_MODEL, SuperResolution, bicubic_upscale
+
+
+# Arayüzde gösterilecek adım adları
+STAGE_LABELS = {
+    "denoise": "Gürültü azaltma",
+    "contrast": "Kontrast",
+    "sharpen": "Keskinleştirme",
+    "super_res": "Süper çözünürlük"
+}
+
+
+class JobCancelledError(CancelledError):
+    pass
+
+
+class Job:
+
+
+    def __init__(self,
+                 job_id: int,
+                 params: dict,
+                 progressive: bool = False,
+                 preview_model: str = None):
+
+        self.id = job_id
+        self.params = params
+        self.progressive = progressive
+        self.preview_model = preview_model
+        self.status = "queued"
+        self.stage = None
+        self.completed = 0
+        self.total = len(pipeline_stages(params))
+        self.warnings = []
+        self.created = time.time()
+
+        # Aşamalı modda model çalışırken gösterilecek hızlı önizleme
+        self.preview = None
+
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def progress(self) -> float:
+        return self.completed / self.total if self.total else 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def cancel(self):
+
+        # Sıradaki iş hiç başlamaz; çalışan iş bir sonraki adım sınırında durur
+        self._cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.status = "cancelled"
+
+    def result(self, timeout: float = None) -> np.ndarray:
+        return self.future.result(timeout)
+
+    def _report(self, stage: str, completed: int, total: int):
+
+        if self._cancel_event.is_set():
+            raise JobCancelledError(f"İş {self.id} iptal edildi")
+
+        self.stage = stage
+        self.completed = completed
+        self.total = total
+
+
+# İşçi thread başına yüklenmiş modeller (aynı model eşzamanlı kullanılmaz)
+_worker_models = threading.local()
+
+
+def _get_worker_model(model_name: str, scale: int, models_dir: str) -> tuple:
+
+    # (model, uyarı): yüklenemeyen model de saklanır, her iş indirmeyi yeniden denemez
+    models = getattr(_worker_models, "models", None)
+    if models is None:
+        models = _worker_models.models = {}
+
+    key = (model_name, scale, models_dir)
+    if key not in models:
+        try:
+            models[key] = (SuperResolution(model_name=model_name, scale=scale,
+                                           models_dir=models_dir), None)
+        except Exception as e:
+            models[key] = (None, f"Model yüklenemedi, bicubic kullanılıyor: {e}")
+
+    return models[key]
+
+
+class JobManager:
+
+
+    def __init__(self,
+                 max_workers: int = None,
+                 models_dir: str = "./models",
+                 cv_threads: int = None,
+                 limits: ResourceLimits = None):
+
+        # Varsayılan: çekirdeklerin yarısı (OpenCV her işte zaten çok thread kullanır)
+        if max_workers is None:
+            max_workers = int(os.environ.get("ENHANCER_MAX_JOBS", 0)) or \
+                max(1, (os.cpu_count() or 2) // 2)
+
+        self.max_workers = max_workers
+        self.models_dir = models_dir
+
+        # Her iş havuza girerken kabul kontrolünden geçer; bellek limiti
+        # eşzamanlı çalışabilecek işler arasında bölünür
+        self.limits = (limits or ResourceLimits.from_env()).per_worker(max_workers)
+
+        # OpenCV thread havuzu süreç geneldir: eşzamanlı işler çekirdekleri
+        # paylaşsın diye iş başına düşen thread sayısı sınırlanabilir
+        if cv_threads is None and os.environ.get("ENHANCER_CV_THREADS"):
+            cv_threads = int(os.environ["ENHANCER_CV_THREADS"])
+        if cv_threads is not None:
+            configure_threads(cv_threads)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="enhance")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = {}
+
+        # Gruptaki en son iş (aynı oturumdan gelen yeni istek eskisini iptal eder)
+        self._latest = {}
+
+    def submit(self,
+               image: np.ndarray,
+               params: dict,
+               progressive: bool = False,
+               preview_model: str = None,
+               callback=None,
+               supersede: str = None) -> Job:
+
+        # Limiti aşan iş hafifletilir veya ResourceLimitError ile reddedilir
+        plan = admit(image.shape, image.dtype, params, self.limits)
+        params = plan["params"]
+
+        with self._lock:
+            job = Job(next(self._ids), params,
+                      progressive and params["super_res_enabled"], preview_model)
+            job.warnings.extend(f"Plan hafifletildi: {action}" for action in plan["actions"])
+            self._jobs[job.id] = job
+
+            # Yeni istek aynı gruptaki önceki işi geçersiz kılar; çalışan iş
+            # sonucunu teslim etmeden bir sonraki adım sınırında durur
+            if supersede is not None:
+                previous = self._latest.get(supersede)
+                if previous is not None:
+                    previous.cancel()
+                self._latest[supersede] = job
+
+        # Çağıran girdiyi değiştirebilir, arka plan için kopya alınır
+        job.future = self._executor.submit(self._run, job, image.copy())
+
+        # Biten (veya başlamadan iptal edilen) işler tabloda tutulmaz;
+        # sonuç Job nesnesinde kalır
+        job.future.add_done_callback(lambda f: self._discard(job.id))
+
+        # Callback sadece başarılı sonuçta çağrılır
+        if callback is not None:
+            job.future.add_done_callback(
+                lambda f: callback(f.result())
+                if not f.cancelled() and f.exception() is None else None
+            )
+
+        return job
+
+    def _run(self, job: Job, image: np.ndarray) -> np.ndarray:
+
+        try:
+            job._report(None, 0, job.total)
+            job.status = "running"
+
+            # Süper çözünürlük modeli (yüklenemezse pipeline bicubic kullanır)
+            sr = None
+            if job.params["super_res_enabled"] and job.params["model_name"] != BICUBIC_MODEL:
+                sr, warning = _get_worker_model(job.params["model_name"],
+                                                job.params["scale"],
+                                                self.models_dir)
+                if warning is not None:
+                    job.warnings.append(warning)
+
+            if job.progressive:
+                result = self._run_progressive(job, image, sr)
+            else:
+                result = run_pipeline(image, job.params, sr=sr, progress=job._report)
+            job.status = "done"
+
+            return result
+        except JobCancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception:
+            job.status = "failed"
+            raise
+
+    def _run_progressive(self, job: Job, image: np.ndarray, sr) -> np.ndarray:
+
+        # Ön adımlar, hızlı önizleme, sonra model; hepsi aynı havuz işçisinde
+        base = run_pipeline(
+            image,
+            {**job.params, "super_res_enabled": False},
+            progress=lambda stage, completed, total: job._report(stage, completed, job.total)
+        )
+
+        # Önizleme modeli (ör. ESPCN) yüklenemezse bicubic kullanılır
+        preview_sr = None
+        if job.preview_model not in (None, BICUBIC_MODEL):
+            preview_sr, warning = _get_worker_model(job.preview_model,
+                                                    job.params["scale"],
+                                                    self.models_dir)
+            if warning is not None:
+                job.warnings.append(f"Önizleme: {warning}")
+
+        if preview_sr is not None:
+            job.preview = preview_sr.upscale(base)
+        else:
+            job.preview = bicubic_upscale(base, job.params["scale"])
+
+        job._report("super_res", job.total - 1, job.total)
+        result = super_resolve(base, job.params, sr)
+        job._report(None, job.total, job.total)
+
+        return result
+
+    def _discard(self, job_id: int):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            for group in [g for g, job in self._latest.items() if job.id == job_id]:
+                del self._latest[group]
+
+    def get(self, job_id: int) -> Job:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @property
+    def active_jobs(self) -> list:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self, wait: bool = False):
+
+        for job in self.active_jobs:
+            job.cancel()
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,115 @@
+# Luma/Chroma Isleme Modulu
+# Agir islemleri (NLM, super cozunurluk, keskinlestirme) sadece parlaklik (Y)
+# kanalinda calistirir; renk kanallari dusuk cozunurlukte ucuz filtrelerle islenir
+
+import cv2
+import numpy as np
+from typing import Tuple
+
+from .noise_reduction import denoise_image
+from .contrast_enhance import enhance_contrast_and_brightness
+from .sharpening import unsharp_mask
+from .super_resolution import SuperResolution, upscale_tiled
+
+
+def split_luma_chroma(image: np.ndarray,
+                      chroma_scale: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+
+    # BGR'den YCrCb'ye tek seferde dönüştür
+    ycrcb = cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)
+
+    luma = np.ascontiguousarray(ycrcb[:, :, 0])
+    chroma = ycrcb[:, :, 1:]
+
+    # Renk kanallarını küçült (4:2:0 benzeri) - göz renk detayına daha az duyarlı
+    if chroma_scale < 1.0:
+        chroma = cv2.resize(chroma, None,
+                            fx=chroma_scale, fy=chroma_scale,
+                            interpolation=cv2.INTER_AREA)
+    else:
+        chroma = np.ascontiguousarray(chroma)
+
+    return luma, chroma
+
+
+def merge_luma_chroma(luma: np.ndarray, chroma: np.ndarray) -> np.ndarray:
+
+    height, width = luma.shape[:2]
+
+    # Renk kanallarını parlaklık boyutuna tek bir bicubic ile büyüt
+    if chroma.shape[:2] != (height, width):
+        chroma = cv2.resize(chroma, (width, height), interpolation=cv2.INTER_CUBIC)
+
+    ycrcb = cv2.merge([luma, chroma[:, :, 0], chroma[:, :, 1]])
+
+    # YCrCb'den BGR'ye tek seferde geri dönüştür
+    return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR)
+
+
+def denoise_chroma(chroma: np.ndarray, kernel_size: int = 5) -> np.ndarray:
+
+    # Renk gürültüsü düşük frekanslıdır, basit Gaussian blur yeterli
+    return cv2.GaussianBlur(chroma, (kernel_size, kernel_size), 0)
+
+
+def enhance_luma_chroma(image: np.ndarray,
+                        denoise_strength: int = None,
+                        clahe_clip_limit: float = None,
+                        gamma: float = None,
+                        sharpen_amount: float = None,
+                        sr: SuperResolution = None,
+                        scale: int = 1,
+                        chroma_scale: float = 0.5,
+                        tile_size: int = None,
+                        progress=None) -> np.ndarray:
+
+    # İlerleme raporu pipeline ile aynı adım adlarını kullanır
+    stages = [name for name, enabled in (("denoise", denoise_strength is not None),
+                                         ("contrast", clahe_clip_limit is not None),
+                                         ("sharpen", sharpen_amount is not None),
+                                         ("super_res", sr is not None or scale > 1))
+              if enabled]
+    report = progress or (lambda stage, done, total: None)
+
+    # Adım 0: Renk uzayı dönüşümü (bir kez)
+    luma, chroma = split_luma_chroma(image, chroma_scale=chroma_scale)
+
+    # Adım 1: Gürültü azaltma - NLM sadece Y kanalında, renkte ucuz blur
+    if denoise_strength is not None:
+        report("denoise", stages.index("denoise"), len(stages))
+        luma = denoise_image(luma, filter_strength=denoise_strength)
+        chroma = denoise_chroma(chroma)
+
+    # Adım 2: Kontrast - CLAHE ve gamma zaten parlaklık işlemleri
+    if clahe_clip_limit is not None:
+        report("contrast", stages.index("contrast"), len(stages))
+        luma = enhance_contrast_and_brightness(
+            luma,
+            clahe_clip_limit=clahe_clip_limit,
+            gamma=gamma,
+            auto_brightness=gamma is None
+        )
+
+    # Adım 3: Keskinleştirme - kenar bilgisi Y kanalında
+    if sharpen_amount is not None:
+        report("sharpen", stages.index("sharpen"), len(stages))
+        luma = unsharp_mask(luma, amount=sharpen_amount)
+
+    # Adım 4: Süper çözünürlük - DNN sadece Y kanalında, renk bicubic ile
+    # merge_luma_chroma içinde büyütülür
+    if "super_res" in stages:
+        report("super_res", stages.index("super_res"), len(stages))
+    if sr is not None and tile_size:
+        luma = upscale_tiled(sr.upscale_luma, luma, sr.scale, tile_size)
+    elif sr is not None:
+        luma = sr.upscale_luma(luma)
+    elif scale > 1:
+        height, width = luma.shape[:2]
+        luma = cv2.resize(luma, (width * scale, height * scale),
+                          interpolation=cv2.INTER_CUBIC)
+
+    # Adım 5: BGR'ye geri dönüşüm (bir kez)
+    result = merge_luma_chroma(luma, chroma)
+    report(None, len(stages), len(stages))
+
+    return result
@@ -3,12 +3,23 @@
 import cv2
 import numpy as np
 
+from .utils import to_float32, from_float32
+
 
 def denoise_image(image: np.ndarray, 
                   filter_strength: int = 10,
                   template_window_size: int = 7,
                   search_window_size: int = 21) -> np.ndarray:
     
+    # Float (0-1) ve 16-bit girdi: NLM sadece 16-bit + NORM_L1 destekler
+    if image.dtype in (np.float32, np.uint16):
+        return _denoise_high_depth(
+            image,
+            filter_strength,
+            template_window_size,
+            search_window_size
+        )
+    
     # Görüntünün renkli mi yoksa gri tonlamalı mı olduğunu kontrol et
     if len(image.shape) == 3 and image.shape[2] == 3:
         # Renkli görüntü için fastNlMeansDenoisingColored kullan
@@ -34,6 +45,60 @@ def denoise_image(image: np.ndarray,
     return denoised
 
 
+def _denoise_l1(plane: np.ndarray,
+                filter_strength: float,
+                template_window_size: int,
+                search_window_size: int) -> np.ndarray:
+    
+    # 8-bit NLM (L2) ağırlığı exp(-ort(d^2) / h^2), L1 ağırlığı ise
+    # exp(-(toplam|d|)^2 / (h^2 * kanal)). Gaussian gürültüde E|d| = σ·sqrt(2/π)
+    # olduğundan aynı güç için h, sqrt(2·kanal/π) ile ve 16-bit ölçeğine (x257) taşınır
+    channels = plane.shape[2] if len(plane.shape) == 3 else 1
+    h = filter_strength * 257.0 * np.sqrt(2.0 * channels / np.pi)
+    
+    return cv2.fastNlMeansDenoising(
+        plane,
+        h=[h] * channels,
+        templateWindowSize=template_window_size,
+        searchWindowSize=search_window_size,
+        normType=cv2.NORM_L1
+    )
+
+
+def _denoise_high_depth(image: np.ndarray,
+                        filter_strength: float,
+                        template_window_size: int,
+                        search_window_size: int) -> np.ndarray:
+    
+    output_dtype = image.dtype
+    image = to_float32(image)
+    
+    if len(image.shape) == 2 or image.shape[2] == 1:
+        plane = from_float32(image, np.uint16)
+        denoised = _denoise_l1(plane, filter_strength,
+                               template_window_size, search_window_size)
+        return from_float32(to_float32(denoised), output_dtype)
+    
+    # fastNlMeansDenoisingColored ile aynı yol: 8-bit Lab ölçeğinde L ve ab
+    # ayrı ayrı işlenir (burada 16-bit hassasiyetle)
+    lab = cv2.cvtColor(image, cv2.COLOR_BGR2Lab)
+    lab[:, :, 0] *= 255.0 / 100.0
+    lab[:, :, 1:] += 128.0
+    lab16 = np.rint(np.clip(lab * 257.0, 0, 65535)).astype(np.uint16)
+    
+    luma = _denoise_l1(np.ascontiguousarray(lab16[:, :, 0]), filter_strength,
+                       template_window_size, search_window_size)
+    chroma = _denoise_l1(np.ascontiguousarray(lab16[:, :, 1:]), filter_strength,
+                         template_window_size, search_window_size)
+    
+    lab = np.dstack([luma, chroma]).astype(np.float32) * (1.0 / 257.0)
+    lab[:, :, 0] *= 100.0 / 255.0
+    lab[:, :, 1:] -= 128.0
+    denoised = cv2.cvtColor(lab, cv2.COLOR_Lab2BGR)
+    
+    return from_float32(denoised, output_dtype)
+
+
 def denoise_video_frame(frame: np.ndarray,
                         prev_frames: list = None,
                         filter_strength: int = 4,
@@ -0,0 +1,55 @@
+# Paralellik Ayar Modulu
+# Isci basina OpenCV/DNN thread sayisini ayarlar ve istege bagli olarak isci
+# sureclerini cekirdek kumelerine sabitler (ayni makinedeki isciler birbirini ezmesin)
+
+import os
+
+import cv2
+
+
+def available_cores() -> list:
+
+    # Sürecin çalışabileceği çekirdekler (cgroup/taskset kısıtları dahil)
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def core_sets(workers: int, threads_per_worker: int, cores: list = None) -> list:
+
+    # Her işçiye ardışık, çakışmayan bir çekirdek kümesi; çekirdek yetmezse
+    # kümeler baştan tekrar kullanılır
+    cores = cores if cores is not None else available_cores()
+    if not cores:
+        raise ValueError("Kullanılabilir çekirdek yok")
+
+    sets = []
+    for worker in range(workers):
+        start = worker * threads_per_worker
+        sets.append([cores[(start + i) % len(cores)] for i in range(threads_per_worker)])
+
+    return sets
+
+
+def configure_threads(threads: int = None, cores: list = None) -> dict:
+
+    # threads: OpenCV iç thread havuzu boyutu (DNN çıkarımı dahil, süreç geneli)
+    # cores: bu sürecin sabitleneceği çekirdekler (None ise dokunulmaz)
+    if cores:
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, set(cores))
+        else:
+            print("[UYARI] Bu platformda çekirdek sabitleme desteklenmiyor")
+
+        # Sabitlenen süreçte OpenCV varsayılanı (tüm çekirdekler) kümeyi aşar
+        if threads is None:
+            threads = len(set(cores))
+
+    if threads is not None:
+        cv2.setNumThreads(threads)
+
+    return {
+        "threads": cv2.getNumThreads(),
+        "cores": available_cores()
+    }
+
@@ -0,0 +1,165 @@
+# Islem Pipeline Modulu
+# Gurultu azaltma -> kontrast -> keskinlestirme -> super cozunurluk adimlarini
+# tek bir parametre sozlugu ile calistirir; hazir ayarlari (preset) yukler
+
+import json
+import os
+
+import numpy as np
+
+from .noise_reduction import denoise_image
+from .contrast_enhance import enhance_contrast_and_brightness
+from .sharpening import unsharp_mask
+from .super_resolution import SuperResolution, bicubic_upscale, upscale_tiled
+from .luma_chroma import enhance_luma_chroma
+from .utils import to_float32, from_float32
+
+
+# Hazır ayar dosyasının varsayılan yolu (src/tuning.py tarafından üretilir)
+PRESETS_PATH = "./presets.json"
+
+# Arayüzdeki varsayılan değerlerle aynı
+DEFAULT_PARAMS = {
+    "denoise_enabled": True,
+    "denoise_strength": 10,
+    "contrast_enabled": True,
+    "clahe_clip": 2.0,
+    "gamma": 1.0,
+    "sharpen_enabled": True,
+    "sharpen_amount": 1.5,
+    "super_res_enabled": True,
+    "model_name": "fsrcnn",
+    "scale": 2,
+    "luma_mode": False,
+    "float_mode": False,
+    "sr_tile_size": None
+}
+
+
+def run_pipeline(image: np.ndarray,
+                 params: dict,
+                 sr: SuperResolution = None,
+                 progress=None) -> np.ndarray:
+
+    params = {**DEFAULT_PARAMS, **params}
+
+    # Float modu (16-bit girdide zorunlu): ara sonuçlar tek bir float32
+    # tamponda tutulur, kuantalama sadece en sonda bir kez yapılır
+    output_dtype = image.dtype
+    float_mode = params["float_mode"] or image.dtype != np.uint8
+    if float_mode:
+        image = to_float32(image)
+
+    result = _run_stages(image, params, sr, progress)
+
+    if float_mode:
+        result = from_float32(result, output_dtype)
+
+    return result
+
+
+def pipeline_stages(params: dict) -> list:
+
+    # Parametrelere göre çalışacak adımların sırası (ilerleme raporu için)
+    params = {**DEFAULT_PARAMS, **params}
+    stages = []
+    if params["denoise_enabled"]:
+        stages.append("denoise")
+    if params["contrast_enabled"]:
+        stages.append("contrast")
+    if params["sharpen_enabled"]:
+        stages.append("sharpen")
+    if params["super_res_enabled"]:
+        stages.append("super_res")
+
+    return stages
+
+
+def _run_stages(image: np.ndarray,
+                params: dict,
+                sr: SuperResolution = None,
+                progress=None) -> np.ndarray:
+
+    super_res_enabled = params["super_res_enabled"]
+    scale = params["scale"]
+    gamma = params["gamma"] if params["gamma"] != 1.0 else None
+
+    # Luma modu: ağır işlemler sadece Y kanalında
+    if params["luma_mode"]:
+        return enhance_luma_chroma(
+            image,
+            denoise_strength=params["denoise_strength"] if params["denoise_enabled"] else None,
+            clahe_clip_limit=params["clahe_clip"] if params["contrast_enabled"] else None,
+            gamma=gamma,
+            sharpen_amount=params["sharpen_amount"] if params["sharpen_enabled"] else None,
+            sr=sr if super_res_enabled else None,
+            scale=scale if super_res_enabled else 1,
+            tile_size=params["sr_tile_size"],
+            progress=progress
+        )
+
+    # progress(adım, tamamlanan, toplam) her adımdan önce çağrılır; istisna
+    # fırlatarak işi adımlar arasında iptal edebilir
+    stages = pipeline_stages(params)
+    report = progress or (lambda stage, done, total: None)
+
+    result = image.copy()
+
+    # 1. Gürültü Azaltma
+    if params["denoise_enabled"]:
+        report("denoise", stages.index("denoise"), len(stages))
+        result = denoise_image(result, filter_strength=params["denoise_strength"])
+
+    # 2. Kontrast İyileştirme
+    if params["contrast_enabled"]:
+        report("contrast", stages.index("contrast"), len(stages))
+        result = enhance_contrast_and_brightness(
+            result,
+            clahe_clip_limit=params["clahe_clip"],
+            gamma=gamma,
+            auto_brightness=gamma is None
+        )
+
+    # 3. Keskinleştirme
+    if params["sharpen_enabled"]:
+        report("sharpen", stages.index("sharpen"), len(stages))
+        result = unsharp_mask(result, amount=params["sharpen_amount"])
+
+    # 4. Süper Çözünürlük
+    if super_res_enabled:
+        report("super_res", stages.index("super_res"), len(stages))
+        result = super_resolve(result, params, sr)
+
+    report(None, len(stages), len(stages))
+
+    return result
+
+
+def super_resolve(image: np.ndarray,
+                  params: dict,
+                  sr: SuperResolution = None) -> np.ndarray:
+
+    # Model yüklenemediyse bicubic; karo boyutu verilmişse DNN belleği
+    # tek karo ile sınırlanır
+    params = {**DEFAULT_PARAMS, **params}
+    if sr is not None and params["sr_tile_size"]:
+        return upscale_tiled(sr.upscale, image, sr.scale, params["sr_tile_size"])
+    if sr is not None:
+        return sr.upscale(image)
+    return bicubic_upscale(image, params["scale"])
+
+
+def load_presets(path: str = PRESETS_PATH) -> dict:
+
+    # Dosya yoksa hazır ayar da yoktur (tuning henüz çalıştırılmamış)
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    # Her hazır ayar, eksik alanları varsayılanlarla tamamlanmış parametrelerdir
+    return {
+        name: {**DEFAULT_PARAMS, **preset["params"]}
+        for name, preset in data.get("presets", {}).items()
+    }
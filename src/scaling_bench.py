@@ -0,0 +1,160 @@
+# Paralel Olcekleme Benchmark Modulu
+# Farkli (isci x thread) yerlesimlerinde SharedFramePool ile ayni kareleri isler,
+# saniyedeki kare sayisini olcer ve makine icin en iyi yerlesimi raporlar
+# Kullanim: python -m src.scaling_bench --workers 1 2 4 --threads 1 2 4
+
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+from .parallelism import available_cores
+from .pipeline import DEFAULT_PARAMS, load_presets
+from .shared_frames import SharedFramePool
+from .utils import list_images_in_directory, load_image
+
+
+def load_frames(input_dir: str = None,
+                count: int = 16,
+                size: tuple = (640, 480)) -> list:
+
+    # Havuz sabit boyutlu slot kullanır: tüm kareler aynı boyuta getirilir
+    if input_dir is not None:
+        images = [load_image(path) for path in list_images_in_directory(input_dir)]
+        if not images:
+            raise ValueError(f"Klasörde görüntü yok: {input_dir}")
+        frames = [cv2.resize(images[i % len(images)], size, interpolation=cv2.INTER_AREA)
+                  for i in range(count)]
+        return frames
+
+    # Girdi yoksa gürültülü sentetik kareler (NLM'nin gerçekçi iş yapması için)
+    rng = np.random.default_rng(0)
+    width, height = size
+    gradient = np.tile(np.linspace(0, 255, width, dtype=np.float32), (height, 1))
+    frames = []
+    for _ in range(count):
+        noise = rng.normal(0, 12, (height, width, 3)).astype(np.float32)
+        frame = np.clip(gradient[:, :, None] + noise, 0, 255).astype(np.uint8)
+        frames.append(frame)
+
+    return frames
+
+
+def benchmark_layout(frames: list,
+                     params: dict,
+                     workers: int,
+                     threads: int,
+                     pin_cores: bool = False,
+                     models_dir: str = "./models") -> dict:
+
+    with SharedFramePool(frames[0].shape, params,
+                         workers=workers,
+                         slots=2 * workers,
+                         models_dir=models_dir,
+                         threads_per_worker=threads,
+                         pin_cores=pin_cores) as pool:
+
+        # Isınma: her işçi modelini yükler ve thread havuzunu başlatır
+        for _ in pool.map(frames[:workers]):
+            pass
+
+        start = time.perf_counter()
+        for _ in pool.map(frames):
+            pass
+        elapsed = time.perf_counter() - start
+
+    megapixels = sum(frame.shape[0] * frame.shape[1] for frame in frames) / 1e6
+
+    return {
+        "workers": workers,
+        "threads": threads,
+        "pinned": pin_cores,
+        "seconds": elapsed,
+        "fps": len(frames) / elapsed,
+        "mp_per_second": megapixels / elapsed
+    }
+
+
+def run_benchmark(frames: list,
+                  params: dict,
+                  worker_counts: list,
+                  thread_counts: list,
+                  pin_cores: bool = False,
+                  oversubscribe: bool = False,
+                  models_dir: str = "./models") -> list:
+
+    cores = len(available_cores())
+    results = []
+
+    for workers in worker_counts:
+        for threads in thread_counts:
+            # Çekirdekten fazla thread isteyen yerleşimler varsayılan olarak atlanır
+            if workers * threads > cores and not oversubscribe:
+                print(f"[INFO] Atlandı: {workers} işçi x {threads} thread > {cores} çekirdek")
+                continue
+
+            result = benchmark_layout(frames, params, workers, threads,
+                                      pin_cores=pin_cores, models_dir=models_dir)
+            results.append(result)
+
+            print(f"[INFO] {workers} işçi x {threads} thread: "
+                  f"{result['fps']:.2f} kare/s, {result['mp_per_second']:.2f} MP/s")
+
+    return results
+
+
+def best_layout(results: list) -> dict:
+    return max(results, key=lambda r: r["fps"]) if results else None
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="İşçi x thread ölçekleme benchmark'ı")
+    parser.add_argument("--input", default=None, help="Girdi görüntü klasörü (yoksa sentetik)")
+    parser.add_argument("--frames", type=int, default=16, help="Ölçülen kare sayısı")
+    parser.add_argument("--size", default="640x480", help="Kare boyutu (GENxYUK)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--pin", action="store_true", help="İşçileri çekirdek kümelerine sabitle")
+    parser.add_argument("--oversubscribe", action="store_true",
+                        help="Çekirdek sayısını aşan yerleşimleri de ölç")
+    parser.add_argument("--preset", default=None, help="Hazır ayar adı (presets.json)")
+    parser.add_argument("--models-dir", default="./models")
+    parser.add_argument("--output", default=None, help="Sonuç JSON dosyası")
+    args = parser.parse_args()
+
+    params = dict(DEFAULT_PARAMS)
+    if args.preset is not None:
+        presets = load_presets()
+        if args.preset not in presets:
+            raise ValueError(f"Hazır ayar bulunamadı: {args.preset}. "
+                             f"Mevcut ayarlar: {list(presets.keys())}")
+        params = presets[args.preset]
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    frames = load_frames(args.input, args.frames, (width, height))
+
+    print(f"[INFO] {len(available_cores())} çekirdek, {len(frames)} kare ({width}x{height})")
+
+    results = run_benchmark(frames, params, args.workers, args.threads,
+                            pin_cores=args.pin,
+                            oversubscribe=args.oversubscribe,
+                            models_dir=args.models_dir)
+
+    best = best_layout(results)
+    if best is None:
+        print("[UYARI] Ölçülecek yerleşim kalmadı (--oversubscribe deneyin)")
+        return
+
+    print(f"[INFO] En iyi yerleşim: {best['workers']} işçi x {best['threads']} thread "
+          f"({best['fps']:.2f} kare/s)")
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"params": params, "results": results, "best": best}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Sahne Istatistikleri Modulu
+# Video icin parlaklik, bulaniklik ve gurultu tahminlerini alt orneklenmis
+# piksellerden artimli olarak gunceller (ustel yumusatma ile)
+
+import cv2
+import numpy as np
+
+
+class SceneStatistics:
+
+
+    def __init__(self,
+                 alpha: float = 0.1,
+                 stride: int = 4,
+                 tile_size: int = 64,
+                 tiles_per_update: int = 8):
+
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha 0 ile 1 arasında olmalı: {alpha}")
+
+        self.alpha = alpha
+        self.stride = stride
+        self.tile_size = tile_size
+        self.tiles_per_update = tiles_per_update
+
+        self.reset()
+
+    def reset(self):
+
+        self.brightness = None
+        self.blur = None
+        self.noise = None
+        self.frame_count = 0
+
+        # Her karede farklı karolar işlenir, bir sonraki başlangıç karosu
+        self._tile_cursor = 0
+
+    def _smooth(self, previous: float, value: float) -> float:
+
+        # İlk değer doğrudan alınır, sonrakiler üstel yumuşatılır
+        if previous is None:
+            return value
+        return previous + self.alpha * (value - previous)
+
+    def _tile_origins(self, height: int, width: int) -> list:
+
+        size = self.tile_size
+        ys = range(0, max(height - size, 0) + 1, size)
+        xs = range(0, max(width - size, 0) + 1, size)
+
+        return [(y, x) for y in ys for x in xs]
+
+    def update(self, frame: np.ndarray) -> "SceneStatistics":
+
+        # Değerler bit derinliğinden bağımsız olarak 8-bit ölçeğinde tutulur
+        # (eşikler 8-bit içindir); 16-bit/float kare buna göre ölçeklenir
+        if np.issubdtype(frame.dtype, np.floating):
+            scale = 255.0
+        else:
+            scale = 255.0 / np.iinfo(frame.dtype).max
+
+        # Parlaklık: seyrek piksel ızgarasının ortalaması
+        sample = np.ascontiguousarray(frame[::self.stride, ::self.stride])
+        if len(sample.shape) == 3:
+            sample = cv2.cvtColor(sample, cv2.COLOR_BGR2GRAY)
+        brightness = float(np.mean(sample))
+
+        # Bulanıklık ve gürültü: tam çözünürlüklü birkaç karo
+        # (alt örnekleme Laplacian varyansını değiştirir, karolar değiştirmez)
+        origins = self._tile_origins(frame.shape[0], frame.shape[1])
+        count = min(self.tiles_per_update, len(origins))
+
+        blur_values = []
+        noise_values = []
+        for i in range(count):
+            y, x = origins[(self._tile_cursor + i) % len(origins)]
+            tile = frame[y:y + self.tile_size, x:x + self.tile_size]
+            if len(tile.shape) == 3:
+                tile = cv2.cvtColor(tile, cv2.COLOR_BGR2GRAY)
+
+            # float32 girdi CV_64F Laplacian desteklemez
+            depth = cv2.CV_32F if tile.dtype == np.float32 else cv2.CV_64F
+            blur_values.append(float(cv2.Laplacian(tile, depth).var()))
+
+            blurred = cv2.GaussianBlur(tile, (5, 5), 0)
+            noise = np.abs(tile.astype(np.float64) - blurred.astype(np.float64))
+            noise_values.append(np.std(noise))
+
+        # Karolar karelere yayılarak tüm sahne zamanla taranır
+        self._tile_cursor = (self._tile_cursor + count) % len(origins)
+
+        self.brightness = self._smooth(self.brightness, brightness * scale)
+        self.blur = self._smooth(self.blur, float(np.mean(blur_values)) * scale * scale)
+        self.noise = self._smooth(self.noise, float(np.mean(noise_values)) * scale)
+        self.frame_count += 1
+
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self.frame_count > 0
@@ -0,0 +1,296 @@
+# Paylasimli Bellek Kare Aktarim Modulu
+# Surecler arasi kareleri pickle etmeden, multiprocessing.shared_memory uzerindeki
+# slot halkasi ile tasir; surecler sadece slot indeksi ve boyut bilgisi paylasir
+
+import multiprocessing
+import sys
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .admission import ResourceLimits, admit
+from .parallelism import configure_threads, core_sets
+from .pipeline import DEFAULT_PARAMS, run_pipeline
+from .super_resolution import BICUBIC_MODEL, SuperResolution
+
+
+# Süreçler arasında gönderilen tek şey: slot numarası, boyut ve veri tipi
+FrameHandle = namedtuple("FrameHandle", ["slot", "shape", "dtype"])
+
+
+class SharedFrameRing:
+
+
+    def __init__(self,
+                 slot_count: int,
+                 slot_bytes: int,
+                 context=None):
+
+        if slot_count < 1 or slot_bytes < 1:
+            raise ValueError(f"Geçersiz halka boyutu: {slot_count} slot x {slot_bytes} bayt")
+
+        context = context or multiprocessing.get_context()
+
+        self.slot_count = slot_count
+        self.slot_bytes = slot_bytes
+        self._owner = True
+
+        self._shm = shared_memory.SharedMemory(create=True, size=slot_count * slot_bytes)
+
+        # Her slotun referans sayısı; 0 olan slot boştur ve yeniden kullanılabilir
+        self._refcounts = context.Array("i", slot_count, lock=False)
+        self._condition = context.Condition()
+        self._cursor = 0
+
+    def __getstate__(self):
+
+        # Sadece süreç başlatılırken (Pool initializer) aktarılabilir
+        return {
+            "name": self._shm.name,
+            "slot_count": self.slot_count,
+            "slot_bytes": self.slot_bytes,
+            "refcounts": self._refcounts,
+            "condition": self._condition
+        }
+
+    def __setstate__(self, state):
+
+        self.slot_count = state["slot_count"]
+        self.slot_bytes = state["slot_bytes"]
+        self._refcounts = state["refcounts"]
+        self._condition = state["condition"]
+        self._owner = False
+        self._cursor = 0
+
+        # Bloğun sahibi sadece oluşturan süreçtir; bağlanan süreç kayıt açmaz
+        if sys.version_info >= (3, 13):
+            self._shm = shared_memory.SharedMemory(name=state["name"], track=False)
+            return
+
+        # Python < 3.13: bağlanırken blok resource_tracker'a yine kaydedilir.
+        # fork/spawn/forkserver ile başlayan işçi üst sürecin tracker'ını
+        # devralır; oradaki kayıt sahibin kaydıdır ve silinmemelidir. Sadece
+        # kendi tracker'ını başlatan (ilgisiz) süreçte kayıt geri alınır
+        from multiprocessing import resource_tracker
+        inherited = resource_tracker._resource_tracker._fd is not None
+
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+
+        if not inherited:
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+
+    def view(self, handle: FrameHandle) -> np.ndarray:
+
+        # Kopyasız numpy görünümü
+        return np.ndarray(
+            handle.shape,
+            dtype=np.dtype(handle.dtype),
+            buffer=self._shm.buf,
+            offset=handle.slot * self.slot_bytes
+        )
+
+    def acquire(self, shape: tuple, dtype=np.uint8, timeout: float = None):
+
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        if nbytes > self.slot_bytes:
+            raise ValueError(f"Kare slota sığmıyor: {nbytes} > {self.slot_bytes} bayt")
+
+        # Boş slot yoksa bir slot serbest kalana kadar bekle
+        with self._condition:
+            while True:
+                for i in range(self.slot_count):
+                    slot = (self._cursor + i) % self.slot_count
+                    if self._refcounts[slot] == 0:
+                        self._refcounts[slot] = 1
+                        self._cursor = (slot + 1) % self.slot_count
+                        handle = FrameHandle(slot, tuple(shape), dtype.str)
+                        return handle, self.view(handle)
+
+                if not self._condition.wait(timeout):
+                    raise TimeoutError("Boş kare slotu beklenirken zaman aşımı")
+
+    def put(self, frame: np.ndarray, timeout: float = None) -> FrameHandle:
+
+        # Üretici kareyi doğrudan slota yazar (tek kopya)
+        handle, view = self.acquire(frame.shape, frame.dtype, timeout)
+        view[...] = frame
+
+        return handle
+
+    def retain(self, handle: FrameHandle):
+
+        with self._condition:
+            if self._refcounts[handle.slot] <= 0:
+                raise RuntimeError(f"Serbest slot tekrar tutulamaz: {handle.slot}")
+            self._refcounts[handle.slot] += 1
+
+    def release(self, handle: FrameHandle):
+
+        with self._condition:
+            if self._refcounts[handle.slot] <= 0:
+                raise RuntimeError(f"Slot zaten serbest: {handle.slot}")
+            self._refcounts[handle.slot] -= 1
+
+            # Slot boşaldı: bekleyen üreticileri uyandır
+            if self._refcounts[handle.slot] == 0:
+                self._condition.notify_all()
+
+    def close(self):
+
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+# İşçi süreç durumu (Pool initializer ile bir kez kurulur)
+_WORKER_STATE = {}
+
+
+def _init_worker(input_ring: SharedFrameRing,
+                 output_ring: SharedFrameRing,
+                 params: dict,
+                 models_dir: str,
+                 threads: int = None,
+                 worker_cores: list = None,
+                 worker_counter=None):
+
+    # Her işçi kendi thread sayısını ve (istenirse) çekirdek kümesini alır
+    cores = None
+    if worker_cores:
+        with worker_counter.get_lock():
+            index = worker_counter.value
+            worker_counter.value += 1
+        cores = worker_cores[index % len(worker_cores)]
+    configure_threads(threads, cores)
+
+    sr = None
+    if params["super_res_enabled"] and params["model_name"] != BICUBIC_MODEL:
+        try:
+            sr = SuperResolution(
+                model_name=params["model_name"],
+                scale=params["scale"],
+                models_dir=models_dir
+            )
+        except Exception as e:
+            print(f"[UYARI] Model yüklenemedi, bicubic kullanılıyor: {e}")
+
+    _WORKER_STATE.update(
+        input_ring=input_ring,
+        output_ring=output_ring,
+        params=params,
+        sr=sr
+    )
+
+
+def _enhance_slot(handle: FrameHandle) -> FrameHandle:
+
+    input_ring = _WORKER_STATE["input_ring"]
+    output_ring = _WORKER_STATE["output_ring"]
+
+    try:
+        frame = input_ring.view(handle)
+        result = run_pipeline(frame, _WORKER_STATE["params"], sr=_WORKER_STATE["sr"])
+    finally:
+        # Girdi slotu işlem biter bitmez üreticiye geri verilir
+        input_ring.release(handle)
+
+    output_handle, output = output_ring.acquire(result.shape, result.dtype)
+    output[...] = result
+
+    return output_handle
+
+
+class SharedFramePool:
+
+
+    def __init__(self,
+                 frame_shape: tuple,
+                 params: dict = None,
+                 workers: int = 2,
+                 slots: int = 8,
+                 dtype=np.uint8,
+                 models_dir: str = "./models",
+                 threads_per_worker: int = None,
+                 pin_cores: bool = False,
+                 limits: ResourceLimits = None):
+
+        # Kare boyutu sabit olduğundan kabul kontrolü bir kez yapılır; işçiler
+        # hafifletilmiş planın modelini yükler. Limit aşılırsa ResourceLimitError
+        limits = (limits or ResourceLimits.from_env()).per_worker(workers)
+        plan = admit(frame_shape, dtype, params or {}, limits)
+        self.params = plan["params"]
+
+        # Çıktı slotları süper çözünürlük ölçeğine göre büyütülür
+        scale = self.params["scale"] if self.params["super_res_enabled"] else 1
+        itemsize = np.dtype(dtype).itemsize
+        input_bytes = int(np.prod(frame_shape)) * itemsize
+        output_bytes = input_bytes * scale * scale
+
+        context = multiprocessing.get_context()
+
+        # Girdi ve çıktı ayrı halkalarda: dolu girdi halkası çıktı yazımını kilitlemez
+        self.input_ring = SharedFrameRing(slots, input_bytes, context)
+        self.output_ring = SharedFrameRing(slots, output_bytes, context)
+
+        # Thread sayısı verilmezse OpenCV her işçide tüm çekirdekleri kullanır;
+        # sabitlemede ise işçinin thread sayısı çekirdek kümesi kadardır
+        worker_cores = None
+        if pin_cores:
+            worker_cores = core_sets(workers, threads_per_worker or 1)
+
+        self._pool = context.Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(self.input_ring, self.output_ring, self.params, models_dir,
+                      threads_per_worker, worker_cores, context.Value("i", 0))
+        )
+
+    def submit(self, frame: np.ndarray):
+        handle = self.input_ring.put(frame)
+        return self._pool.apply_async(_enhance_slot, (handle,))
+
+    def fetch(self, pending) -> np.ndarray:
+
+        # Sonucu kopyalayıp slotu hemen serbest bırak
+        handle, view = self.fetch_view(pending)
+        result = view.copy()
+        del view
+        self.release(handle)
+
+        return result
+
+    def fetch_view(self, pending):
+
+        # Kopyasız erişim: çağıran işi bitince release(handle) çağırmalı
+        handle = pending.get()
+        return handle, self.output_ring.view(handle)
+
+    def release(self, handle: FrameHandle):
+        self.output_ring.release(handle)
+
+    def map(self, frames):
+
+        # Sıra korunur; halka dolunca submit boş slot bekler
+        pending = []
+        for frame in frames:
+            pending.append(self.submit(frame))
+            if len(pending) >= self.input_ring.slot_count:
+                yield self.fetch(pending.pop(0))
+
+        for item in pending:
+            yield self.fetch(item)
+
+    def close(self):
+
+        self._pool.close()
+        self._pool.join()
+        self.input_ring.close()
+        self.output_ring.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -4,6 +4,9 @@
 import cv2
 import numpy as np
 
+from .scene_stats import SceneStatistics
+from .utils import get_max_value
+
 
 def unsharp_mask(image: np.ndarray,
                  kernel_size: tuple = (5, 5),
@@ -11,25 +14,31 @@ def unsharp_mask(image: np.ndarray,
                  amount: float = 1.5,
                  threshold: int = 0) -> np.ndarray:
     
+    # Float32 girdi kopyalanmaz; eşik 8-bit ölçeğinden girdinin ölçeğine taşınır
+    max_value = get_max_value(image.dtype)
+    image_float = image.astype(np.float32, copy=False)
+    
     # Adım 1: Gaussian blur uygula (bulanık versiyon oluştur)
-    blurred = cv2.GaussianBlur(image, kernel_size, sigma)
+    blurred = cv2.GaussianBlur(image, kernel_size, sigma).astype(np.float32, copy=False)
     
     # Adım 2: Orijinal ve bulanık görüntü arasındaki farkı hesapla
     # Bu fark, kenar bilgisini içerir
     if threshold > 0:
         # Eşik değeri varsa, küçük farkları yoksay (gürültü filtreleme)
-        diff = image.astype(np.float32) - blurred.astype(np.float32)
-        mask = np.abs(diff) > threshold
+        diff = image_float - blurred
+        mask = np.abs(diff) > threshold * max_value / 255.0
         diff = diff * mask
     else:
-        diff = image.astype(np.float32) - blurred.astype(np.float32)
+        diff = image_float - blurred
     
     # Adım 3: Keskinleştirilmiş görüntüyü oluştur
     # sharpened = original + amount * (original - blurred)
-    sharpened = image.astype(np.float32) + amount * diff
+    sharpened = image_float + amount * diff
     
-    # Değerleri 0-255 aralığına sınırla ve uint8'e dönüştür
-    sharpened = np.clip(sharpened, 0, 255).astype(np.uint8)
+    # Değerleri geçerli aralığa sınırla; float girdi float kalır (kuantalama yok)
+    sharpened = np.clip(sharpened, 0, max_value)
+    if image.dtype != np.float32:
+        sharpened = sharpened.astype(image.dtype)
     
     return sharpened
 
@@ -37,8 +46,9 @@ def unsharp_mask(image: np.ndarray,
 def laplacian_sharpening(image: np.ndarray, 
                          strength: float = 1.0) -> np.ndarray:
     
-    # Görüntüyü float'a dönüştür
-    image_float = image.astype(np.float32)
+    # Görüntüyü float'a dönüştür (zaten float32 ise kopyalama)
+    max_value = get_max_value(image.dtype)
+    image_float = image.astype(np.float32, copy=False)
     
     # Laplacian filtresi uygula
     laplacian = cv2.Laplacian(image_float, cv2.CV_32F)
@@ -47,8 +57,10 @@ def laplacian_sharpening(image: np.ndarray,
     # (Laplacian negatif kenarlar için negatif değer verir)
     sharpened = image_float - strength * laplacian
     
-    # Değerleri sınırla ve uint8'e dönüştür
-    sharpened = np.clip(sharpened, 0, 255).astype(np.uint8)
+    # Değerleri sınırla; float girdi float kalır, tamsayı girdi kendi tipine döner
+    sharpened = np.clip(sharpened, 0, max_value)
+    if image.dtype != np.float32:
+        sharpened = sharpened.astype(image.dtype)
     
     return sharpened
 
@@ -86,11 +98,21 @@ def kernel_sharpening(image: np.ndarray,
 
 
 def adaptive_sharpening(image: np.ndarray,
-                        blur_threshold: float = 100.0) -> np.ndarray:
+                        blur_threshold: float = 100.0,
+                        stats: SceneStatistics = None) -> np.ndarray:
     
-    # Bulanıklık seviyesini Laplacian varyansı ile hesapla
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
-    laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+    if stats is not None and stats.ready:
+        # Video: yumuşatılmış sahne bulanıklığını kullan (titreme olmaz);
+        # SceneStatistics değerleri zaten 8-bit ölçeğindedir
+        laplacian_var = stats.blur
+    else:
+        # Bulanıklık seviyesini Laplacian varyansı ile hesapla
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image
+        depth = cv2.CV_32F if gray.dtype == np.float32 else cv2.CV_64F
+        laplacian_var = float(cv2.Laplacian(gray, depth).var())
+        
+        # Eşikler 8-bit ölçeğindedir; 16-bit/float varyansı ölçekle
+        laplacian_var *= (255.0 / get_max_value(image.dtype)) ** 2
     
     # Bulanıklık seviyesine göre keskinleştirme miktarını belirle
     if laplacian_var < blur_threshold * 0.5:
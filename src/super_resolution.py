@@ -6,6 +6,8 @@ import numpy as np
 import os
 import urllib.request
 
+from .utils import to_float32, from_float32
+
 
 # Model indirme URL'leri (resmi OpenCV modelleri)
 MODEL_URLS = {
@@ -31,6 +33,13 @@ MODEL_URLS = {
     }
 }
 
+# Sadece Y (parlaklık) kanalında çalışan modeller
+# EDSR ise RGB modelidir ve üç kanal bekler
+LUMA_MODELS = ("fsrcnn", "espcn", "lapsrn")
+
+# Model dosyası olmayan bicubic büyütme; pipeline sr=None ile bunu uygular
+BICUBIC_MODEL = "bicubic"
+
 
 def download_model(model_name: str, scale: int, models_dir: str) -> str:
     
@@ -120,10 +129,40 @@ class SuperResolution:
         if self.sr is None:
             raise RuntimeError("Model yüklenmemiş. Lütfen sınıfı tekrar başlatın.")
         
+        # Float/16-bit girdi: model 0-255 ölçeğinde float kabul eder,
+        # ancak dnn_superres çıktısı her zaman 8-bit'tir
+        if image.dtype != np.uint8:
+            result = to_float32(self.sr.upsample(to_float32(image) * 255.0))
+            return result if image.dtype == np.float32 else from_float32(result, image.dtype)
+        
         # Görüntüyü yükselt
         result = self.sr.upsample(image)
         
         return result
+    
+    def upscale_luma(self, luma: np.ndarray) -> np.ndarray:
+        
+        if self.sr is None:
+            raise RuntimeError("Model yüklenmemiş. Lütfen sınıfı tekrar başlatın.")
+        
+        # Float/16-bit girdi modele 0-255 ölçeğinde float olarak verilir
+        source = luma if luma.dtype == np.uint8 else to_float32(luma) * 255.0
+        
+        # FSRCNN/ESPCN/LapSRN tek kanallı girdiyi doğrudan işler
+        # (renkli girdide de zaten sadece Y kanalı modele verilir)
+        if self.model_name in LUMA_MODELS:
+            result = self.sr.upsample(source)
+        else:
+            # EDSR üç kanal bekler: Y kanalını çoğalt, çıktıyı tekrar tek kanala indir
+            bgr = cv2.merge([source, source, source])
+            result = cv2.cvtColor(self.sr.upsample(bgr), cv2.COLOR_BGR2GRAY)
+        
+        # dnn_superres çıktısı her zaman 8-bit'tir
+        if luma.dtype == np.uint8:
+            return result
+        
+        result = to_float32(result)
+        return result if luma.dtype == np.float32 else from_float32(result, luma.dtype)
 
 
 def upscale_image(image: np.ndarray,
@@ -145,3 +184,42 @@ def bicubic_upscale(image: np.ndarray, scale: int = 2) -> np.ndarray:
     new_size = (width * scale, height * scale)
     
     return cv2.resize(image, new_size, interpolation=cv2.INTER_CUBIC)
+
+
+def upscale_tiled(upscale_fn,
+                  image: np.ndarray,
+                  scale: int,
+                  tile_size: int = 256,
+                  overlap: int = 8) -> np.ndarray:
+    
+    height, width = image.shape[:2]
+    
+    # Küçük görüntüde karolara bölmeye gerek yok
+    if height <= tile_size and width <= tile_size:
+        return upscale_fn(image)
+    
+    output = None
+    
+    # Karolar örtüşmeli işlenir, kenar etkisi olan şerit kırpılarak birleştirilir
+    # (DNN ara katmanları tüm görüntü yerine tek karo kadar bellek kullanır)
+    for y in range(0, height, tile_size):
+        for x in range(0, width, tile_size):
+            y0, x0 = max(y - overlap, 0), max(x - overlap, 0)
+            y1 = min(y + tile_size + overlap, height)
+            x1 = min(x + tile_size + overlap, width)
+            
+            tile = upscale_fn(np.ascontiguousarray(image[y0:y1, x0:x1]))
+            
+            if output is None:
+                output = np.empty((height * scale, width * scale) + tile.shape[2:],
+                                  dtype=tile.dtype)
+            
+            # Örtüşme payını çıkarıp karonun kendi bölgesini yerleştir
+            top = (y - y0) * scale
+            left = (x - x0) * scale
+            rows = (min(y + tile_size, height) - y) * scale
+            cols = (min(x + tile_size, width) - x) * scale
+            output[y * scale:y * scale + rows, x * scale:x * scale + cols] = \
+                tile[top:top + rows, left:left + cols]
+    
+    return output
@@ -0,0 +1,266 @@
+# Kalite/Hiz Ayar Modulu
+# Pipeline parametrelerini ornek goruntu seti uzerinde tarar, sure ile
+# PSNR/SSIM olcer ve Pareto-optimal noktalari hazir ayar olarak kaydeder
+# Kullanim: python -m src.tuning --input girdi/ --reference referans/
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from .pipeline import DEFAULT_PARAMS, PRESETS_PATH, run_pipeline
+from .super_resolution import BICUBIC_MODEL, SuperResolution
+from .utils import calculate_psnr, calculate_ssim, list_images_in_directory, load_image
+
+
+# Arayüzdeki kaydırıcı aralıklarından seçilmiş tarama noktaları.
+# gamma 1.0 otomatik parlaklık demektir. Ölçek taranmaz: çıktı boyutu
+# kalite/hız değil ürün kararıdır ve farklı çözünürlükteki metrikler
+# karşılaştırılamaz; tek bir referans seti tek bir ölçeğe karşılık gelir
+# (süper çözünürlük de bu yüzden hep açıktır; en hızlı aday bicubic'tir)
+DEFAULT_SEARCH_SPACE = {
+    "denoise_enabled": [False, True],
+    "denoise_strength": [5, 10, 15],
+    "contrast_enabled": [False, True],
+    "clahe_clip": [1.0, 2.0, 3.0],
+    "gamma": [0.8, 1.0, 1.2],
+    "sharpen_enabled": [False, True],
+    "sharpen_amount": [1.0, 1.5, 2.0],
+    "super_res_enabled": [True],
+    "model_name": [BICUBIC_MODEL, "fsrcnn", "espcn", "lapsrn", "edsr"],
+    "scale": [2],
+    "luma_mode": [False, True]
+}
+
+# Bir adım kapalıyken anlamsız olan parametreler
+STAGE_PARAMS = {
+    "denoise_enabled": ["denoise_strength"],
+    "contrast_enabled": ["clahe_clip", "gamma"],
+    "sharpen_enabled": ["sharpen_amount"],
+    "super_res_enabled": ["model_name"]
+}
+
+PRESET_NAMES = ("realtime", "balanced", "archive")
+
+
+def load_sample_pairs(input_dir: str,
+                      reference_dir: str) -> List[Tuple[np.ndarray, np.ndarray]]:
+
+    # Girdi ve referans görüntüleri dosya adına göre eşleştir
+    references = {
+        os.path.basename(path): path
+        for path in list_images_in_directory(reference_dir)
+    }
+
+    samples = []
+    for path in list_images_in_directory(input_dir):
+        name = os.path.basename(path)
+        if name in references:
+            samples.append((load_image(path), load_image(references[name])))
+        else:
+            print(f"[UYARI] Referans bulunamadı, atlanıyor: {name}")
+
+    if not samples:
+        raise ValueError(f"Eşleşen girdi/referans çifti yok: {input_dir}, {reference_dir}")
+
+    return samples
+
+
+def _normalize(params: dict) -> dict:
+
+    # Kapalı adımların parametrelerini varsayılana çek (tekrarlı denemeleri önler)
+    params = dict(params)
+    for flag, dependents in STAGE_PARAMS.items():
+        if not params[flag]:
+            for key in dependents:
+                params[key] = DEFAULT_PARAMS[key]
+
+    return params
+
+
+def generate_configs(search_space: dict = None,
+                     max_configs: int = None,
+                     seed: int = 0) -> List[dict]:
+
+    space = {**{k: [v] for k, v in DEFAULT_PARAMS.items()},
+             **(search_space or DEFAULT_SEARCH_SPACE)}
+
+    keys = list(space.keys())
+    configs = []
+    seen = set()
+    for values in itertools.product(*(space[k] for k in keys)):
+        params = _normalize(dict(zip(keys, values)))
+        key = tuple(sorted(params.items()))
+        if key not in seen:
+            seen.add(key)
+            configs.append(params)
+
+    # Uzay çok büyükse tekrarlanabilir rastgele alt küme
+    if max_configs is not None and len(configs) > max_configs:
+        configs = random.Random(seed).sample(configs, max_configs)
+
+    return configs
+
+
+def evaluate_config(params: dict,
+                    samples: List[Tuple[np.ndarray, np.ndarray]],
+                    sr: SuperResolution = None,
+                    repeats: int = 1) -> dict:
+
+    times = []
+    psnr_values = []
+    ssim_values = []
+
+    for image, reference in samples:
+        # En iyi süre alınır (ilk çağrı ısınma maliyetini içerebilir)
+        best = math.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = run_pipeline(image, params, sr=sr)
+            best = min(best, time.perf_counter() - start)
+
+        # Metrikler ücretsiz bir yeniden boyutlandırma ile karşılaştırılmaz
+        if result.shape != reference.shape:
+            raise ValueError(f"Çıktı boyutu referansla eşleşmiyor: "
+                             f"{result.shape} != {reference.shape}")
+
+        times.append(best)
+        psnr_values.append(calculate_psnr(reference, result))
+        ssim_values.append(calculate_ssim(reference, result))
+
+    return {
+        "params": params,
+        "time": float(np.mean(times)),
+        "psnr": float(np.mean(psnr_values)),
+        "ssim": float(np.mean(ssim_values))
+    }
+
+
+def sweep(samples: List[Tuple[np.ndarray, np.ndarray]],
+          configs: List[dict],
+          models_dir: str = "./models",
+          repeats: int = 1) -> List[dict]:
+
+    # Modeller bir kez yüklenir, yüklenemeyenlerin denemeleri atlanır
+    models = {}
+    results = []
+
+    for i, params in enumerate(configs):
+        # Bicubic (ve SR kapalı) denemeleri model gerektirmez, her zaman çalışır
+        sr = None
+        if params["super_res_enabled"] and params["model_name"] != BICUBIC_MODEL:
+            key = (params["model_name"], params["scale"])
+            if key not in models:
+                try:
+                    models[key] = SuperResolution(
+                        model_name=key[0],
+                        scale=key[1],
+                        models_dir=models_dir
+                    )
+                except Exception as e:
+                    print(f"[UYARI] Model yüklenemedi, atlanıyor: {key[0]} x{key[1]} ({e})")
+                    models[key] = None
+            sr = models[key]
+            if sr is None:
+                continue
+
+        try:
+            result = evaluate_config(params, samples, sr=sr, repeats=repeats)
+        except ValueError as e:
+            print(f"[UYARI] Ayar atlanıyor: {e}")
+            continue
+        results.append(result)
+        print(f"[INFO] {i + 1}/{len(configs)} süre={result['time']:.3f}s "
+              f"psnr={result['psnr']:.2f} ssim={result['ssim']:.4f}")
+
+    return results
+
+
+def pareto_front(results: List[dict], metric: str = "ssim") -> List[dict]:
+
+    # Süreye göre sırala; daha yavaş bir nokta ancak kaliteyi artırıyorsa kalır
+    ordered = sorted(results, key=lambda r: (r["time"], -r[metric]))
+
+    front = []
+    best_quality = -math.inf
+    for result in ordered:
+        if result[metric] > best_quality:
+            front.append(result)
+            best_quality = result[metric]
+
+    return front
+
+
+def select_presets(front: List[dict], metric: str = "ssim") -> dict:
+
+    if not front:
+        raise ValueError("Pareto cephesi boş, hazır ayar seçilemez.")
+
+    realtime = front[0]
+    archive = front[-1]
+
+    # Dengeli: log(süre) ve kalite eksenleri normalize edildiğinde
+    # ideal noktaya (en hızlı + en kaliteli) en yakın nokta
+    log_times = [math.log(max(r["time"], 1e-6)) for r in front]
+    qualities = [r[metric] for r in front]
+    time_span = (max(log_times) - min(log_times)) or 1.0
+    quality_span = (max(qualities) - min(qualities)) or 1.0
+
+    def distance(index):
+        t = (log_times[index] - min(log_times)) / time_span
+        q = (max(qualities) - qualities[index]) / quality_span
+        return t * t + q * q
+
+    balanced = front[min(range(len(front)), key=distance)]
+
+    return dict(zip(PRESET_NAMES, (realtime, balanced, archive)))
+
+
+def save_presets(presets: dict, front: List[dict], path: str = PRESETS_PATH):
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+
+    data = {"presets": presets, "pareto_front": front}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+    print(f"[INFO] Hazır ayarlar kaydedildi: {path}")
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Kalite/hız Pareto hazır ayar üretici")
+    parser.add_argument("--input", required=True, help="Girdi görüntü klasörü")
+    parser.add_argument("--reference", required=True, help="Referans görüntü klasörü")
+    parser.add_argument("--output", default=PRESETS_PATH, help="Hazır ayar JSON dosyası")
+    parser.add_argument("--models-dir", default="./models")
+    parser.add_argument("--metric", choices=["ssim", "psnr"], default="ssim")
+    parser.add_argument("--max-configs", type=int, default=200,
+                        help="Taranacak en fazla ayar (0: tüm uzay)")
+    parser.add_argument("--repeats", type=int, default=1)
+    args = parser.parse_args()
+
+    samples = load_sample_pairs(args.input, args.reference)
+    configs = generate_configs(max_configs=args.max_configs or None)
+    print(f"[INFO] {len(samples)} örnek, {len(configs)} ayar taranacak")
+
+    results = sweep(samples, configs, models_dir=args.models_dir, repeats=args.repeats)
+    front = pareto_front(results, metric=args.metric)
+    presets = select_presets(front, metric=args.metric)
+
+    for name, preset in presets.items():
+        print(f"[INFO] {name}: süre={preset['time']:.3f}s {args.metric}={preset[args.metric]:.4f}")
+
+    save_presets(presets, front, path=args.output)
+
+
+if __name__ == "__main__":
+    main()
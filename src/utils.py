@@ -6,6 +6,8 @@ import numpy as np
 import os
 from typing import Tuple, List
 
+from .scene_stats import SceneStatistics
+
 
 def load_image(path: str) -> np.ndarray:
     
@@ -28,6 +30,36 @@ def load_image(path: str) -> np.ndarray:
     return image
 
 
+def get_max_value(dtype) -> float:
+    
+    # Float görüntüler 0-1 aralığında tutulur
+    if np.issubdtype(dtype, np.floating):
+        return 1.0
+    
+    return float(np.iinfo(dtype).max)
+
+
+def to_float32(image: np.ndarray) -> np.ndarray:
+    
+    # 8/16-bit görüntüyü 0-1 aralığında float32'ye çevir (kayıpsız)
+    if image.dtype == np.float32:
+        return image
+    
+    return image.astype(np.float32) * (1.0 / get_max_value(image.dtype))
+
+
+def from_float32(image: np.ndarray, dtype=np.uint8) -> np.ndarray:
+    
+    # Pipeline sonunda tek seferlik kuantalama
+    if np.dtype(dtype) == np.float32:
+        return np.clip(image, 0.0, 1.0).astype(np.float32, copy=False)
+    
+    max_value = get_max_value(dtype)
+    scaled = np.clip(image, 0.0, 1.0) * max_value
+    
+    return np.rint(scaled).astype(dtype)
+
+
 def save_image(image: np.ndarray, path: str, quality: int = 95) -> bool:
     
     # Dizin yoksa oluştur
@@ -38,6 +70,12 @@ def save_image(image: np.ndarray, path: str, quality: int = 95) -> bool:
     # Dosya uzantısına göre kaydet
     ext = os.path.splitext(path)[1].lower()
     
+    # PNG/TIFF 16-bit saklayabilir, diğer formatlar 8-bit ister
+    if image.dtype != np.uint8:
+        target = np.uint16 if ext in ['.png', '.tif', '.tiff'] else np.uint8
+        if image.dtype != target:
+            image = from_float32(to_float32(image), target)
+    
     if ext in ['.jpg', '.jpeg']:
         params = [cv2.IMWRITE_JPEG_QUALITY, quality]
     elif ext == '.png':
@@ -78,7 +116,12 @@ def calculate_psnr(original: np.ndarray, enhanced: np.ndarray) -> float:
     if original.shape != enhanced.shape:
         enhanced = cv2.resize(enhanced, (original.shape[1], original.shape[0]))
     
-    return cv2.PSNR(original, enhanced)
+    # Bit derinlikleri farklıysa ikisi de 0-1 float32 ölçeğine taşınır
+    if original.dtype != enhanced.dtype:
+        original, enhanced = to_float32(original), to_float32(enhanced)
+    
+    # 16-bit görüntülerde tepe değeri 65535'tir
+    return cv2.PSNR(original, enhanced, get_max_value(original.dtype))
 
 
 def calculate_ssim(original: np.ndarray, enhanced: np.ndarray) -> float:
@@ -87,6 +130,9 @@ def calculate_ssim(original: np.ndarray, enhanced: np.ndarray) -> float:
     if original.shape != enhanced.shape:
         enhanced = cv2.resize(enhanced, (original.shape[1], original.shape[0]))
     
+    if original.dtype != enhanced.dtype:
+        original, enhanced = to_float32(original), to_float32(enhanced)
+    
     # Gri tonlamaya çevir
     if len(original.shape) == 3:
         original_gray = cv2.cvtColor(original, cv2.COLOR_BGR2GRAY)
@@ -95,9 +141,10 @@ def calculate_ssim(original: np.ndarray, enhanced: np.ndarray) -> float:
         original_gray = original
         enhanced_gray = enhanced
     
-    # SSIM parametreleri
-    C1 = (0.01 * 255) ** 2
-    C2 = (0.03 * 255) ** 2
+    # SSIM parametreleri (dinamik aralık bit derinliğine göre)
+    max_value = get_max_value(original.dtype)
+    C1 = (0.01 * max_value) ** 2
+    C2 = (0.03 * max_value) ** 2
     
     # Gaussian blur uygula
     original_gray = original_gray.astype(np.float64)
@@ -132,16 +179,19 @@ def estimate_blur_level(image: np.ndarray) -> Tuple[float, str]:
     
     laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
     
+    return laplacian_var, describe_blur_level(laplacian_var)
+
+
+def describe_blur_level(laplacian_var: float) -> str:
+    
     if laplacian_var < 50:
-        description = "Çok bulanık"
+        return "Çok bulanık"
     elif laplacian_var < 100:
-        description = "Bulanık"
+        return "Bulanık"
     elif laplacian_var < 500:
-        description = "Orta keskinlik"
+        return "Orta keskinlik"
     else:
-        description = "Keskin"
-    
-    return laplacian_var, description
+        return "Keskin"
 
 
 def estimate_noise_level(image: np.ndarray) -> Tuple[float, str]:
@@ -156,16 +206,19 @@ def estimate_noise_level(image: np.ndarray) -> Tuple[float, str]:
     noise = np.abs(gray.astype(np.float64) - blurred.astype(np.float64))
     noise_level = np.std(noise)
     
+    return noise_level, describe_noise_level(noise_level)
+
+
+def describe_noise_level(noise_level: float) -> str:
+    
     if noise_level < 3:
-        description = "Gürültüsüz"
+        return "Gürültüsüz"
     elif noise_level < 8:
-        description = "Az gürültülü"
+        return "Az gürültülü"
     elif noise_level < 15:
-        description = "Orta gürültülü"
+        return "Orta gürültülü"
     else:
-        description = "Çok gürültülü"
-    
-    return noise_level, description
+        return "Çok gürültülü"
 
 
 def estimate_brightness(image: np.ndarray) -> Tuple[float, str]:
@@ -177,23 +230,32 @@ def estimate_brightness(image: np.ndarray) -> Tuple[float, str]:
     
     mean_brightness = np.mean(gray)
     
+    return mean_brightness, describe_brightness(mean_brightness)
+
+
+def describe_brightness(mean_brightness: float) -> str:
+    
     if mean_brightness < 50:
-        description = "Çok karanlık"
+        return "Çok karanlık"
     elif mean_brightness < 100:
-        description = "Karanlık"
+        return "Karanlık"
     elif mean_brightness < 180:
-        description = "Normal"
+        return "Normal"
     else:
-        description = "Parlak"
-    
-    return mean_brightness, description
+        return "Parlak"
 
 
-def analyze_image(image: np.ndarray) -> dict:
+def analyze_image(image: np.ndarray, stats: SceneStatistics = None) -> dict:
     
-    blur_val, blur_desc = estimate_blur_level(image)
-    noise_val, noise_desc = estimate_noise_level(image)
-    bright_val, bright_desc = estimate_brightness(image)
+    if stats is not None and stats.ready:
+        # Video: artımlı sahne istatistiklerini kullan (tam tarama yok)
+        blur_val, blur_desc = stats.blur, describe_blur_level(stats.blur)
+        noise_val, noise_desc = stats.noise, describe_noise_level(stats.noise)
+        bright_val, bright_desc = stats.brightness, describe_brightness(stats.brightness)
+    else:
+        blur_val, blur_desc = estimate_blur_level(image)
+        noise_val, noise_desc = estimate_noise_level(image)
+        bright_val, bright_desc = estimate_brightness(image)
     
     return {
         "basic_info": get_image_info(image),
@@ -10,12 +10,13 @@ import tempfile
 import os
 from PIL import Image
 import io
+import time
+import uuid
 
 # Proje modullerini import et
-from src.noise_reduction import denoise_image
-from src.contrast_enhance import enhance_contrast_and_brightness
-from src.sharpening import unsharp_mask
-from src.super_resolution import SuperResolution, bicubic_upscale
+from src.pipeline import load_presets
+from src.admission import ResourceLimitError
+from src.jobs import JobManager, STAGE_LABELS
 from src.utils import analyze_image, get_image_info
 
 
@@ -83,42 +84,70 @@ def extract_frames_from_video(video_path, max_frames=10):
 def process_image(image, denoise_enabled, denoise_strength, 
                   contrast_enabled, clahe_clip, gamma,
                   sharpen_enabled, sharpen_amount,
-                  super_res_enabled, model_name, scale):
+                  super_res_enabled, model_name, scale,
+                  luma_mode=False, float_mode=False, progressive=False):
     
-    result = image.copy()
+    params = {
+        "denoise_enabled": denoise_enabled,
+        "denoise_strength": denoise_strength,
+        "contrast_enabled": contrast_enabled,
+        "clahe_clip": clahe_clip,
+        "gamma": gamma,
+        "sharpen_enabled": sharpen_enabled,
+        "sharpen_amount": sharpen_amount,
+        "super_res_enabled": super_res_enabled,
+        "model_name": model_name,
+        "scale": scale,
+        "luma_mode": luma_mode,
+        "float_mode": float_mode
+    }
     
-    # 1. Gurultu Azaltma
-    if denoise_enabled:
-        result = denoise_image(result, filter_strength=denoise_strength)
-    
-    # 2. Kontrast Iyilestirme
-    if contrast_enabled:
-        gamma_val = gamma if gamma != 1.0 else None
-        result = enhance_contrast_and_brightness(
-            result,
-            clahe_clip_limit=clahe_clip,
-            gamma=gamma_val,
-            auto_brightness=gamma_val is None
+    # Is paylasilan arka plan havuzunda calisir, arayuz donmaz; asamali modda
+    # model calisirken ESPCN (yoksa bicubic) onizleme gosterilir. Ayni oturumun
+    # bekleyen isi yeni islemle gecersiz kalir. Havuz kabul kontrolu yapar:
+    # limit asilirsa plan hafifletilir veya istek reddedilir
+    try:
+        return get_job_manager().submit(
+            image, params,
+            progressive=progressive,
+            preview_model="espcn",
+            supersede=st.session_state.session_id
         )
-    
-    # 3. Keskinlestirme
-    if sharpen_enabled:
-        result = unsharp_mask(result, amount=sharpen_amount)
-    
-    # 4. Super Cozunurluk
-    if super_res_enabled:
-        try:
-            sr = SuperResolution(
-                model_name=model_name,
-                scale=scale,
-                models_dir='./models'
-            )
-            result = sr.upscale(result)
-        except Exception as e:
-            st.warning(f"Model yuklenemedi, bicubic kullaniliyor: {str(e)[:50]}")
-            result = bicubic_upscale(result, scale)
-    
-    return result
+    except ResourceLimitError as e:
+        st.error(str(e))
+        return None
+
+
+# Tum oturumlarin paylastigi is yoneticisi (eszamanli is sayisi sinirli)
+@st.cache_resource
+def get_job_manager():
+    return JobManager(models_dir='./models')
+
+
+# Hazir ayar parametrelerinin sidebar widget anahtarlari
+PRESET_WIDGET_KEYS = {
+    "denoise_enabled": "denoise",
+    "denoise_strength": "denoise_str",
+    "contrast_enabled": "contrast",
+    "clahe_clip": "clahe",
+    "gamma": "gamma",
+    "sharpen_enabled": "sharpen",
+    "sharpen_amount": "sharp_amt",
+    "super_res_enabled": "super_res",
+    "model_name": "model",
+    "scale": "scale",
+    "luma_mode": "luma_mode",
+    "float_mode": "float_mode"
+}
+
+
+# Secilen hazir ayari sidebar widget'larina yazar
+def apply_preset():
+    presets = load_presets()
+    name = st.session_state.preset
+    if name in presets:
+        for param, key in PRESET_WIDGET_KEYS.items():
+            st.session_state[key] = presets[name][param]
 
 
 def main():
@@ -130,6 +159,17 @@ def main():
     with st.sidebar:
         st.header("⚙️ Islem Ayarlari")
         
+        # Hazir ayarlar (python -m src.tuning ile uretilir)
+        presets = load_presets()
+        if presets:
+            st.selectbox(
+                "Hazir Ayar",
+                ["Ozel"] + list(presets.keys()),
+                key="preset",
+                on_change=apply_preset
+            )
+            st.divider()
+        
         # Gurultu Azaltma
         st.subheader("🔇 Gurultu Azaltma")
         denoise_enabled = st.checkbox("Aktif", value=True, key="denoise")
@@ -155,8 +195,16 @@ def main():
         # Super Cozunurluk
         st.subheader("📐 Super Cozunurluk")
         super_res_enabled = st.checkbox("Aktif", value=True, key="super_res")
-        model_name = st.selectbox("Model", ["fsrcnn", "edsr", "espcn", "lapsrn"], key="model")
+        model_name = st.selectbox("Model", ["fsrcnn", "edsr", "espcn", "lapsrn", "bicubic"], key="model")
         scale = st.selectbox("Olcek", [2, 3, 4], key="scale")
+        progressive = st.checkbox("Asamali (once hizli onizleme)", value=False, key="progressive")
+        
+        st.divider()
+        
+        # Performans
+        st.subheader("⚡ Performans")
+        luma_mode = st.checkbox("Luma modu (sadece Y kanali, hizli)", value=False, key="luma_mode")
+        float_mode = st.checkbox("Float32 ara temsil (hassas)", value=False, key="float_mode")
     
     # Ana icerik
     col1, col2 = st.columns(2)
@@ -176,6 +224,10 @@ def main():
         st.session_state.enhanced_image = None
     if 'video_frames' not in st.session_state:
         st.session_state.video_frames = []
+    if 'job' not in st.session_state:
+        st.session_state.job = None
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
     
     # Dosya yuklendi mi?
     if uploaded_file is not None:
@@ -230,16 +282,48 @@ def main():
             
             # Islem butonu
             if st.button("🚀 Islemi Baslat", type="primary", use_container_width=True):
-                with st.spinner("Islem yapiliyor..."):
-                    st.session_state.enhanced_image = process_image(
-                        st.session_state.current_image,
-                        denoise_enabled, denoise_strength,
-                        contrast_enabled, clahe_clip, gamma,
-                        sharpen_enabled, sharpen_amount,
-                        super_res_enabled, model_name, scale
-                    )
-                st.success("✅ Islem tamamlandi!")
-                st.rerun()
+                job = process_image(
+                    st.session_state.current_image,
+                    denoise_enabled, denoise_strength,
+                    contrast_enabled, clahe_clip, gamma,
+                    sharpen_enabled, sharpen_amount,
+                    super_res_enabled, model_name, scale,
+                    luma_mode=luma_mode,
+                    float_mode=float_mode,
+                    progressive=progressive
+                )
+                st.session_state.job = job
+                if job is not None:
+                    st.rerun()
+            
+            # Arka plan isi: adim ilerlemesi ve iptal butonu
+            job = st.session_state.job
+            if job is not None and not job.done():
+                # Asamali mod: model sonucu gelene kadar onizleme goster
+                if job.preview is not None:
+                    st.session_state.enhanced_image = job.preview
+                for warning in job.warnings:
+                    st.info(warning[:80])
+                if job.status == "queued":
+                    st.progress(0.0, text="Sirada bekliyor...")
+                else:
+                    label = STAGE_LABELS.get(job.stage, "Hazirlaniyor")
+                    st.progress(job.progress, text=f"{label} ({min(job.completed + 1, job.total)}/{job.total})")
+                if st.button("⏹️ Iptal Et", use_container_width=True):
+                    job.cancel()
+                    st.session_state.job = None
+                    st.rerun()
+            elif job is not None:
+                st.session_state.job = None
+                for warning in job.warnings:
+                    st.warning(warning[:80])
+                if job.status == "done":
+                    st.session_state.enhanced_image = job.result()
+                    st.success("✅ Islem tamamlandi!")
+                elif job.status == "failed" and job.preview is not None:
+                    st.warning(f"Model iyilestirmesi basarisiz, onizleme kullaniliyor: {str(job.future.exception())[:50]}")
+                elif job.status == "failed":
+                    st.error(f"Islem basarisiz: {str(job.future.exception())[:80]}")
             
             if st.session_state.enhanced_image is not None:
                 st.image(numpy_to_pil(st.session_state.enhanced_image), use_container_width=True)
@@ -261,6 +345,11 @@ def main():
                     mime="image/png",
                     use_container_width=True
                 )
+            
+            # Arka plan isi suruyorsa ilerlemeyi guncellemek icin yenile
+            if st.session_state.job is not None:
+                time.sleep(0.5)
+                st.rerun()
     
     # Bilgi kartlari
     st.divider()